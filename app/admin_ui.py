@@ -8,6 +8,8 @@ from core.api_manager import (
     mask_api_key, get_api_keys_for_dropdown
 )
 from core.logger import get_all_logs, get_user_logs, log_action
+from app.parse_cache import get_cache_stats, clear_cache
+from app import analysis_cache
 
 
 def admin_menu(username: str):
@@ -46,6 +48,42 @@ def show_admin_dashboard():
         logs = get_all_logs()
         st.metric("Total Log Entries", len(logs))
     
+    st.subheader("🗄️ Parse Cache")
+    cache_stats = get_cache_stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}",
+                  help=f"{cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    with col2:
+        st.metric("Cached Reports", cache_stats["entries"])
+    with col3:
+        st.metric("Cache Size", f"{cache_stats['size_bytes'] / 1024 ** 2:.1f} MB")
+
+    if st.button("Clear Parse Cache"):
+        if clear_cache():
+            st.success("✅ Parse cache cleared.")
+            st.rerun()
+        else:
+            st.error("❌ Failed to clear parse cache.")
+
+    st.subheader("🧠 Analysis Cache")
+    analysis_stats = analysis_cache.get_cache_stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Hit Rate", f"{analysis_stats['hit_rate']:.0%}",
+                  help=f"{analysis_stats['hits']} hits, {analysis_stats['misses']} misses")
+    with col2:
+        st.metric("Cached Analyses", analysis_stats["entries"])
+    with col3:
+        st.metric("Cache Size", f"{analysis_stats['size_bytes'] / 1024 ** 2:.1f} MB")
+
+    if st.button("Clear Analysis Cache"):
+        if analysis_cache.clear_cache():
+            st.success("✅ Analysis cache cleared.")
+            st.rerun()
+        else:
+            st.error("❌ Failed to clear analysis cache.")
+
     st.info("💡 Use the sidebar menu to manage API keys, users, and view activity logs.")
 
 
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.constants import PROMPT_VERSION
+from app.lru import lru_evictions
+
+# LLM analyses are cached in this SQLite database, keyed by path fingerprint
+CACHE_DB = Path(__file__).parent.parent / "models" / "analysis_cache.sqlite3"
+
+# Total size of cached results before least-recently-used ones are evicted
+MAX_CACHE_BYTES = 256 * 1024 ** 2
+
+# Cached results older than this are treated as misses and evicted
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# Times and delays are rounded to this many decimals before fingerprinting,
+# so float noise in otherwise identical reports does not defeat the cache
+_FINGERPRINT_DECIMALS = 4
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use"""
+    CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS analyses ("
+        "key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, "
+        "created REAL NOT NULL, accessed REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS analyses_accessed ON analyses (accessed)")
+    conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    return conn
+
+
+def analysis_key(path_fields: Dict[str, Any], model: str, temperature: float, encoding: str = "json") -> str:
+    """Hash the prompt-relevant path fields with the model, temperature, path encoding and prompt version"""
+    fingerprint = {
+        "path": _normalize(path_fields),
+        "model": model,
+        "temperature": temperature,
+        "encoding": encoding,
+        "prompt_version": PROMPT_VERSION,
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, float):
+        return round(value, _FINGERPRINT_DECIMALS)
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def load_analysis(key: str, ttl: float = CACHE_TTL_SECONDS) -> Optional[Dict[str, Any]]:
+    """Return the cached analysis for a key, or None on a miss"""
+    result = None
+    try:
+        with closing(_connect()) as conn, conn:
+            now = time.time()
+            row = conn.execute(
+                "SELECT result FROM analyses WHERE key = ? AND created >= ?", (key, now - ttl)
+            ).fetchone()
+            if row is not None:
+                result = json.loads(row[0])
+                conn.execute("UPDATE analyses SET accessed = ? WHERE key = ?", (now, key))
+            _record_lookup(conn, hit=result is not None)
+    except Exception as e:
+        print(f"Error reading analysis cache entry {key}: {e}")
+    return result
+
+
+def store_analysis(
+    key: str,
+    result: Dict[str, Any],
+    max_bytes: int = MAX_CACHE_BYTES,
+    ttl: float = CACHE_TTL_SECONDS,
+) -> bool:
+    """Write an analysis to the cache and evict expired or excess entries"""
+    try:
+        data = json.dumps(result)
+        with closing(_connect()) as conn, conn:
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, result, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now),
+            )
+            _evict(conn, max_bytes, now - ttl)
+        return True
+    except Exception as e:
+        print(f"Error writing analysis cache entry {key}: {e}")
+        return False
+
+
+def _evict(conn: sqlite3.Connection, max_bytes: int, expired_before: float):
+    """Delete expired entries, then least-recently-used ones until the cache fits in max_bytes"""
+    conn.execute("DELETE FROM analyses WHERE created < ?", (expired_before,))
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+    if total <= max_bytes:
+        return
+    # Loads update accessed, so it orders entries by last use
+    entries = conn.execute("SELECT key, size FROM analyses ORDER BY accessed").fetchall()
+    conn.executemany("DELETE FROM analyses WHERE key = ?", [(key,) for key in lru_evictions(entries, max_bytes)])
+
+
+def _record_lookup(conn: sqlite3.Connection, hit: bool):
+    conn.execute(
+        "INSERT INTO stats (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+        ("hits" if hit else "misses",),
+    )
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counts, hit rate, entry count and total size (admin only)"""
+    stats = {}
+    entries, size = 0, 0
+    try:
+        with closing(_connect()) as conn:
+            stats = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+    except Exception as e:
+        print(f"Error reading analysis cache stats: {e}")
+
+    hits = stats.get("hits", 0)
+    misses = stats.get("misses", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "entries": entries,
+        "size_bytes": size,
+    }
+
+
+def clear_cache() -> bool:
+    """Delete all cached analyses and reset the counters (admin only)"""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute("DELETE FROM analyses")
+            conn.execute("DELETE FROM stats")
+        return True
+    except Exception as e:
+        print(f"Error clearing analysis cache: {e}")
+        return False
@@ -0,0 +1,96 @@
+import copy
+import math
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from app.models import stage_cell_type
+from app.path_table import TimingPathTable
+
+# Default width of the slack buckets in a structural signature, in ns
+DEFAULT_SLACK_BUCKET = 0.1
+
+# Path fields that differ between the members of a cluster
+_MEMBER_FIELDS = ("startpoint", "endpoint", "path_type", "status", "slack", "corner")
+
+Signature = Tuple[str, Optional[int], Tuple[int, ...]]
+
+
+class PathClusters:
+    """
+    Paths grouped by structural signature: the library-cell sequence of the
+    logic chain (instance names stripped), the path type and a slack bucket.
+
+    ``cluster[i]`` is the cluster of path ``i`` and ``representative[c]`` the
+    row of the worst-slack member of cluster ``c``, the only one analyzed.
+    """
+
+    def __init__(self, paths: TimingPathTable, cluster: np.ndarray, representative: np.ndarray):
+        self.paths = paths
+        self.cluster = cluster
+        self.representative = representative
+        self.sizes = np.bincount(cluster, minlength=len(representative))
+
+    def __len__(self) -> int:
+        return len(self.representative)
+
+    def representative_paths(self) -> TimingPathTable:
+        return self.paths.select(self.representative)
+
+    def fan_out(self, analyses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Expand one analysis per cluster (in representative order) to one per path.
+
+        Members share their representative's diagnosis with their own path
+        fields; analyses of clusters with several paths carry a ``cluster``
+        annotation.
+        """
+        results = []
+        for i, c in enumerate(self.cluster.tolist()):
+            representative = int(self.representative[c])
+            result = analyses[c] if i == representative else copy.deepcopy(analyses[c])
+            if i != representative:
+                path = self.paths.path(i).dict()
+                result.update({field: path[field] for field in _MEMBER_FIELDS})
+            size = int(self.sizes[c])
+            if size > 1:
+                rep = self.paths.path(representative)
+                result["cluster"] = {
+                    "size": size,
+                    "representative": f"{rep.startpoint} → {rep.endpoint}",
+                }
+            results.append(result)
+        return results
+
+
+def cluster_paths(table: TimingPathTable, slack_bucket: float = DEFAULT_SLACK_BUCKET) -> PathClusters:
+    """Group the paths of a table by structural signature; clusters keep first-seen order"""
+    if slack_bucket <= 0:
+        raise ValueError("slack_bucket must be positive")
+
+    strings = table.strings
+    # Stage cells repeat heavily, so the cell-type lookup is memoized per string id
+    cell_types: Dict[int, int] = {}
+    type_ids: Dict[str, int] = {}
+    offsets = table.stage_offsets.tolist()
+    stage_cell = table.stage_cell.tolist()
+
+    clusters: Dict[Signature, int] = {}
+    cluster = np.empty(len(table), dtype=np.int64)
+    for i, (path_type, slack) in enumerate(zip(table.path_type.tolist(), table.slack.tolist())):
+        sequence = []
+        for cell in stage_cell[offsets[i]:offsets[i + 1]]:
+            cell_type = cell_types.get(cell)
+            if cell_type is None:
+                name = stage_cell_type(strings[cell])
+                cell_type = cell_types[cell] = type_ids.setdefault(name, len(type_ids))
+            sequence.append(cell_type)
+        bucket = None if math.isnan(slack) else math.floor(slack / slack_bucket)
+        signature = (strings[path_type], bucket, tuple(sequence))
+        cluster[i] = clusters.setdefault(signature, len(clusters))
+
+    # Representative: the lowest-slack member (missing slack ranks last)
+    slack = np.where(np.isnan(table.slack), np.inf, table.slack)
+    order = np.lexsort((slack, cluster))
+    _, first = np.unique(cluster[order], return_index=True)
+    return PathClusters(table, cluster, order[first])
@@ -1,9 +1,26 @@
+# Bump whenever the prompts change so cached LLM analyses are invalidated
+PROMPT_VERSION = "3"
+
+# How paths are written in the prompts, filled into {path_format}
+JSON_PATH_FORMAT = "JSON format"
+
+COMPACT_PATH_FORMAT = """a compact text format:
+- A header line of "|"-separated fields: sp=startpoint, ep=endpoint, clk=clock,
+  type=path_type (max = setup, min = hold), st=status, arr=data arrival time,
+  req=data required time, slack, corner, and lib=a library-cell prefix
+  removed from every cell name below
+- "stages n=<count> delay=<total ns>" summarizing the logic_chain
+- A stage table "# edge pin cell delay": stage number, ^ rise / v fall, pin,
+  library cell, delay in ns
+- Long chains list only their highest-delay stages; an "omitted" line gives
+  the count, total delay and cell mix of the stages left out"""
+
 PROMPT_TEMPLATE = """
 You are a GenAI-powered timing violation debugger for semiconductor design.
-You will receive one STA path at a time in JSON format.
+You will receive one STA path at a time in {path_format}.
 
-### Input Path JSON:
-{path_json}
+### Input Path:
+{path}
 
 ### INSTRUCTION:
 1. If status = "VIOLATED":
@@ -14,8 +31,7 @@ You will receive one STA path at a time in JSON format.
    * Provide a brief confirmation that timing is met
 
 ### OUTPUT FORMAT:
-Return ONLY valid JSON with these keys:
-- "startpoint", "endpoint", "path_type", "status", "slack"
+Return ONLY a valid JSON object with these keys:
 - "root_cause": string (detailed technical explanation)
 - "severity": "critical", "high", "medium", "low"
 - "suggestions": list of objects with "fix", "priority", "explanation"
@@ -23,11 +39,6 @@ Return ONLY valid JSON with these keys:
 
 ### EXAMPLE OUTPUT FOR VIOLATION:
 {{
-  "startpoint": "U1/Q",
-  "endpoint": "U5/D", 
-  "path_type": "max",
-  "status": "VIOLATED",
-  "slack": -0.85,
   "root_cause": "Combinational path delay exceeds clock period due to multiple levels of logic and high fanout",
   "severity": "high",
   "suggestions": [
@@ -46,6 +57,84 @@ Return ONLY valid JSON with these keys:
 }}
 """
 
+BATCH_PROMPT_TEMPLATE = """
+You are a GenAI-powered timing violation debugger for semiconductor design.
+You will receive several STA paths in {path_format}.
+Each path starts on a new line with its "index".
+
+### Input Paths:
+{paths}
+
+### INSTRUCTION:
+For every input path:
+1. If status = "VIOLATED":
+   * Identify the root cause based on path_type, slack, and logic_chain
+   * Provide detailed technical explanation
+   * Suggest 3 specific, actionable fixes with priority levels
+2. If status = "MET":
+   * Provide a brief confirmation that timing is met
+
+### OUTPUT FORMAT:
+Return ONLY a valid JSON object with one key, "analyses": an array with exactly
+one object per input path, each with these keys:
+- "index": the index of the input path it answers
+- "root_cause": string (detailed technical explanation)
+- "severity": "critical", "high", "medium", "low"
+- "suggestions": list of objects with "fix", "priority", "explanation"
+- "estimated_effort": "low", "medium", "high"
+
+### EXAMPLE OUTPUT FOR TWO PATHS:
+{{
+  "analyses": [
+    {{
+      "index": 0,
+      "root_cause": "Combinational path delay exceeds clock period due to multiple levels of logic and high fanout",
+      "severity": "high",
+      "suggestions": [
+        {{
+          "fix": "Insert pipeline register",
+          "priority": "high",
+          "explanation": "Break the long combinational path into two clock cycles"
+        }}
+      ],
+      "estimated_effort": "medium"
+    }},
+    {{
+      "index": 1,
+      "root_cause": "Hold violation from insufficient data path delay on a short register-to-register path",
+      "severity": "medium",
+      "suggestions": [
+        {{
+          "fix": "Insert delay buffers",
+          "priority": "high",
+          "explanation": "Add hold buffers on the data path near the endpoint"
+        }}
+      ],
+      "estimated_effort": "low"
+    }}
+  ]
+}}
+"""
+
+REPAIR_PROMPT_TEMPLATE = """
+You are a GenAI-powered timing violation debugger for semiconductor design.
+Your analysis of the STA path below has missing or invalid fields.
+The path is given in {path_format}.
+
+### Input Path:
+{path}
+
+### Your Valid Fields:
+{answer}
+
+### Fields To Fix:
+{problems}
+
+### OUTPUT FORMAT:
+Return ONLY a valid JSON object with exactly the keys listed under Fields To Fix,
+consistent with your valid fields.
+"""
+
 FEW_SHOT_EXAMPLES = [
     {
         "input": {
@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Union, Mapping, IO
+
+import numpy as np
+
+from app.path_table import STATUS_NAMES, TimingPathTable, TimingPathTableBuilder, worst_rows
+from app.utils import WORST_K_GROUPS, STAParser, detect_compression, map_report, open_report
+
+# Paths are matched across corners on this key
+PathKey = Tuple[str, str, str]
+
+# File name suffixes dropped to name a corner after its report, outermost first
+_COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz")
+_REPORT_SUFFIXES = (".txt", ".rpt", ".log")
+
+
+class CornerMerge:
+    """
+    Paths from several corner reports joined on (startpoint, endpoint, path type).
+
+    ``paths`` holds one row per distinct path: the instance from its worst
+    (lowest slack) corner, with ``corner`` set to that corner's name.
+    ``corner_slack[i, c]`` is the slack of path ``i`` in ``corners[c]``
+    (NaN where the path is absent from that corner's report).
+    """
+
+    def __init__(self, corners: List[str], paths: TimingPathTable, corner_slack: np.ndarray, worst_corner: np.ndarray):
+        self.corners = corners
+        self.paths = paths
+        self.corner_slack = corner_slack
+        self.worst_corner = worst_corner
+
+    @classmethod
+    def from_tables(cls, tables: Mapping[str, TimingPathTable]) -> "CornerMerge":
+        """Join per-corner tables; paths keep the order in which they are first seen"""
+        corners = list(tables)
+        rows: Dict[PathKey, int] = {}
+        instances: List[List[int]] = [[] for _ in corners]
+        for c, table in enumerate(tables.values()):
+            strings = table.strings
+            keys = zip(table.startpoint.tolist(), table.endpoint.tolist(), table.path_type.tolist())
+            for startpoint, endpoint, path_type in keys:
+                key = (strings[startpoint], strings[endpoint], strings[path_type])
+                instances[c].append(rows.setdefault(key, len(rows)))
+
+        # source[r, c] is the row of path r in corner c's table, or -1
+        source = np.full((len(rows), len(corners)), -1, dtype=np.int64)
+        corner_slack = np.full((len(rows), len(corners)), np.nan)
+        for c, table in enumerate(tables.values()):
+            # A path repeated within one report keeps its worst instance there too
+            order = np.argsort(np.nan_to_num(table.slack, nan=np.inf), kind="stable")
+            merged_rows, first = np.unique(np.asarray(instances[c], dtype=np.int64)[order], return_index=True)
+            source[merged_rows, c] = order[first]
+            corner_slack[merged_rows, c] = table.slack[order[first]]
+
+        # Missing slack ranks after any real slack but before an absent corner
+        score = np.where(source >= 0, np.nan_to_num(corner_slack, nan=np.finfo(np.float64).max), np.inf)
+        worst_corner = np.argmin(score, axis=1) if len(corners) else np.zeros(len(rows), dtype=np.int64)
+
+        builder = TimingPathTableBuilder()
+        table_list = list(tables.values())
+        for r, c in enumerate(worst_corner.tolist()):
+            path = table_list[c].path(int(source[r, c]))
+            path.corner = corners[c]
+            builder.add(path)
+        return cls(corners, builder.build(), corner_slack, worst_corner)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def select(self, rows: Union[np.ndarray, List[int]]) -> "CornerMerge":
+        """Return the merge restricted to the given rows (boolean mask or indices)"""
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64, copy=False)
+        return CornerMerge(self.corners, self.paths.select(rows), self.corner_slack[rows], self.worst_corner[rows])
+
+    def filter(self, status: Optional[str] = None, slack_below: Optional[float] = None) -> "CornerMerge":
+        """Keep the paths whose worst-corner instance has ``status`` and slack below ``slack_below``"""
+        keep = np.ones(len(self), dtype=bool)
+        if status is not None:
+            keep &= self.paths.status == STATUS_NAMES.index(status)
+        if slack_below is not None:
+            keep &= self.paths.slack < slack_below
+        return self if keep.all() else self.select(keep)
+
+    def worst(self, k: int, group_by: Optional[str] = None) -> "CornerMerge":
+        """
+        Keep the ``k`` paths with the lowest worst-corner slack (per group with
+        ``group_by``, as in STAParser.worst_paths), worst first.
+        """
+        if group_by not in WORST_K_GROUPS:
+            raise ValueError(f"group_by must be one of {WORST_K_GROUPS}")
+        column = WORST_K_GROUPS[group_by]
+        groups = getattr(self.paths, column).tolist() if column else None
+        return self.select(worst_rows(self.paths.slack, k, groups))
+
+    def slack_by_corner(self, i: int) -> Dict[str, Optional[float]]:
+        """Slack of path ``i`` in every corner (None where it is absent)"""
+        return {
+            corner: None if np.isnan(slack) else slack
+            for corner, slack in zip(self.corners, self.corner_slack[i].tolist())
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One summary row per merged path, for display and export"""
+        rows = []
+        for i, path in enumerate(self.paths):
+            row = {
+                "startpoint": path.startpoint,
+                "endpoint": path.endpoint,
+                "path_type": path.path_type,
+                "worst_corner": path.corner,
+                "worst_slack": path.slack,
+            }
+            row.update({f"slack[{corner}]": slack for corner, slack in self.slack_by_corner(i).items()})
+            rows.append(row)
+        return rows
+
+
+def corner_name(filename: str) -> str:
+    """The corner a report file is named after, e.g. "ss" for ss.rpt.gz"""
+    name = Path(filename).name
+    for suffixes in (_COMPRESSION_SUFFIXES, _REPORT_SUFFIXES):
+        for suffix in suffixes:
+            if name.lower().endswith(suffix) and len(name) > len(suffix):
+                name = name[:-len(suffix)]
+                break
+    return name
+
+
+def parse_corners(
+    reports: Mapping[str, Union[str, Path, bytes, IO]],
+    parser: Optional[STAParser] = None,
+    max_workers: Optional[int] = None,
+) -> CornerMerge:
+    """
+    Parse one report per corner on several cores and merge them.
+
+    ``reports`` maps corner names to report paths, bytes or binary file
+    objects (optionally compressed). File objects such as uploads are spooled
+    to temporary files, and each worker memory-maps its report, or streams it
+    through a decompressor when compressed, as a single report is parsed.
+    Each report is parsed in a ProcessPoolExecutor worker with
+    the parser's Path Type and Path Group filters, which are the same in
+    every corner. Status and slack differ between corners, so those filters
+    are applied to each merged path's worst-corner instance after the join.
+    """
+    parser = parser or STAParser()
+    options = dict(parser.filter_options(), status=None, slack_below=None)
+    spooled = []
+    try:
+        tasks = []
+        for source in reports.values():
+            if not isinstance(source, (str, Path, bytes)):
+                source = _spool(source)
+                spooled.append(source)
+            tasks.append((source, options))
+        if len(tasks) <= 1:
+            tables = [_parse_corner(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_parse_corner, *task) for task in tasks]
+                tables = [future.result() for future in futures]
+    finally:
+        for path in spooled:
+            os.unlink(path)
+    return CornerMerge.from_tables(dict(zip(reports, tables))).filter(parser.status, parser.slack_below)
+
+
+def _spool(fileobj: IO) -> str:
+    """Copy a file object to a temporary file (in 1 MB chunks) that workers can open by path"""
+    fileobj.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".rpt", delete=False) as spool:
+        shutil.copyfileobj(fileobj, spool, 1024 * 1024)
+    fileobj.seek(0)
+    return spool.name
+
+
+def _parse_corner(source: Union[str, Path, bytes], options: Dict[str, Any]) -> TimingPathTable:
+    """Worker entry point: parse one corner report"""
+    parser = STAParser(**options)
+    if isinstance(source, (str, Path)):
+        # Uncompressed reports are scanned in place, releasing pages as the parser moves on
+        data = map_report(source)
+        if not detect_compression(data[:8]):
+            return parser.parse_table(data)
+        data.close()
+    report = open_report(source)
+    try:
+        return parser.parse_table(report)
+    finally:
+        if hasattr(report, "close"):
+            report.close()
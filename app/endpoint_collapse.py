@@ -0,0 +1,116 @@
+from typing import List, Dict, Any
+
+import numpy as np
+
+from app.path_table import TimingPathTable, optional_float
+
+
+class EndpointCollapse:
+    """
+    Paths grouped by (endpoint, path type), keeping only the worst few of each group.
+
+    ``paths`` holds the kept paths in report order and ``group[i]`` is the
+    group of kept path ``i``. Per-group columns (``group_*``) summarize every
+    path in the group, including the collapsed ones.
+    """
+
+    def __init__(
+        self,
+        paths: TimingPathTable,
+        group: np.ndarray,
+        group_endpoint: List[str],
+        group_path_type: List[str],
+        group_paths: np.ndarray,
+        group_violated: np.ndarray,
+        group_kept: np.ndarray,
+        group_worst_slack: np.ndarray,
+        group_best_slack: np.ndarray,
+    ):
+        self.paths = paths
+        self.group = group
+        self.group_endpoint = group_endpoint
+        self.group_path_type = group_path_type
+        self.group_paths = group_paths
+        self.group_violated = group_violated
+        self.group_kept = group_kept
+        self.group_worst_slack = group_worst_slack
+        self.group_best_slack = group_best_slack
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def collapsed(self) -> int:
+        """Number of paths dropped by the collapse"""
+        return int(self.group_paths.sum() - len(self.paths))
+
+    def group_summary(self, g: int) -> Dict[str, Any]:
+        return {
+            "endpoint": self.group_endpoint[g],
+            "path_type": self.group_path_type[g],
+            "paths": int(self.group_paths[g]),
+            "violated": int(self.group_violated[g]),
+            "kept": int(self.group_kept[g]),
+            "collapsed": int(self.group_paths[g] - self.group_kept[g]),
+            "worst_slack": optional_float(self.group_worst_slack[g]),
+            "best_slack": optional_float(self.group_best_slack[g]),
+        }
+
+    def summary_for(self, i: int) -> Dict[str, Any]:
+        """Summary of the group that kept path ``i`` belongs to"""
+        return self.group_summary(int(self.group[i]))
+
+    def groups(self) -> List[Dict[str, Any]]:
+        return [self.group_summary(g) for g in range(len(self.group_endpoint))]
+
+
+def collapse_endpoints(table: TimingPathTable, per_endpoint: int = 1) -> EndpointCollapse:
+    """
+    Keep the ``per_endpoint`` lowest-slack paths into each endpoint.
+
+    Setup (max) and hold (min) paths into the same endpoint are separate
+    groups. Grouping is a single lexsort over the endpoint, path type and
+    slack columns; no paths are materialized.
+    """
+    if per_endpoint < 1:
+        raise ValueError("per_endpoint must be at least 1")
+
+    count = len(table)
+    # Missing slack sorts last within a group
+    slack = np.where(np.isnan(table.slack), np.inf, table.slack)
+    order = np.lexsort((slack, table.path_type, table.endpoint))
+    endpoint = table.endpoint[order]
+    path_type = table.path_type[order]
+
+    new_group = np.ones(count, dtype=bool)
+    new_group[1:] = (endpoint[1:] != endpoint[:-1]) | (path_type[1:] != path_type[:-1])
+    starts = np.flatnonzero(new_group)
+    sorted_group = np.cumsum(new_group) - 1
+    rank = np.arange(count) - starts[sorted_group]
+
+    keep = rank < per_endpoint
+    kept_rows = order[keep]
+    kept_group = sorted_group[keep]
+    report_order = np.argsort(kept_rows, kind="stable")
+
+    sorted_slack = table.slack[order]
+    if count:
+        worst = np.fmin.reduceat(sorted_slack, starts)
+        best = np.fmax.reduceat(sorted_slack, starts)
+        violated = np.add.reduceat(table.violated_mask()[order].astype(np.int64), starts)
+    else:
+        worst = best = np.empty(0)
+        violated = np.empty(0, dtype=np.int64)
+
+    strings = table.strings
+    return EndpointCollapse(
+        paths=table.select(kept_rows[report_order]),
+        group=kept_group[report_order],
+        group_endpoint=[strings[i] for i in endpoint[starts].tolist()],
+        group_path_type=[strings[i] for i in path_type[starts].tolist()],
+        group_paths=np.diff(np.append(starts, count)),
+        group_violated=violated,
+        group_kept=np.bincount(kept_group, minlength=len(starts)),
+        group_worst_slack=worst,
+        group_best_slack=best,
+    )
@@ -1,62 +1,583 @@
 import os
-import json
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Callable, Iterable
 from langchain.chat_models import init_chat_model
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from app.constants import PROMPT_TEMPLATE
-from app.models import TimingPath
+from app.constants import (
+    PROMPT_TEMPLATE, BATCH_PROMPT_TEMPLATE, REPAIR_PROMPT_TEMPLATE, JSON_PATH_FORMAT, COMPACT_PATH_FORMAT
+)
+from app.models import PathRecord
+from app.prompt_encoding import encode_path, encode_batch_entry
+from app.structured_output import validate_analysis, repair_inputs, merge_repair
+from app.json_stream import StreamingJSONObject
+from app.routing import RoutingPolicy, TIER_FAST, TIER_LARGE, TIER_MODELS, LARGE_MODEL_NAME
+from app.token_usage import TokenUsage
+from app.analysis_cache import analysis_key, load_analysis, store_analysis
+from app.rate_limit import RequestScheduler, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE
+
+# Model used for every path unless a RoutingPolicy is given
+MODEL_NAME = LARGE_MODEL_NAME
+MODEL_PROVIDER = "groq"
+TEMPERATURE = 0.1
+
+# Providers whose chat API can constrain responses to a JSON object
+JSON_MODE_PROVIDERS = ("groq", "openai")
+
+# Maximum number of LLM requests in flight in aanalyze_paths
+DEFAULT_CONCURRENCY = 8
+
+# Default prompt size for batched analysis, in estimated tokens
+DEFAULT_BATCH_TOKENS = 6000
+
+# Upper bound on paths per batch, which keeps the JSON array response well
+# inside the model's output limit
+MAX_BATCH_PATHS = 20
+
+# Rough characters-per-token ratio used to estimate prompt sizes
+CHARS_PER_TOKEN = 4
+
+# Expected completion size per analyzed path, charged to the token rate limit
+RESPONSE_TOKENS_PER_PATH = 400
+
+# Repair requests per path before its invalid fields are given up on
+MAX_REPAIR_ATTEMPTS = 2
+
+# Expected completion size per field redone by a repair request
+RESPONSE_TOKENS_PER_REPAIR_FIELD = 150
+
+# Answered fields of an analysis that could not be completed
+_FAILED_FIELDS = {"severity": "unknown", "suggestions": [], "estimated_effort": "unknown"}
 
 
 class TimingAnalyzer:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        # Maximum requests in flight in aanalyze_paths
+        concurrency: int = DEFAULT_CONCURRENCY,
+        # Pack as many paths as fit in this many (estimated) prompt tokens into each request
+        batch_tokens: Optional[int] = None,
+        # False bypasses reading the analysis cache; results are still written to it
+        use_cache: bool = True,
+        # Further keys requests are spread over, each within the rate limits below (429s are retried)
+        pool_keys: Optional[List[str]] = None,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        # Compact path encoding (see app.prompt_encoding), with chains longer than max_stages summarized
+        compact: bool = True,
+        max_stages: Optional[int] = None,
+        # Constrain responses to a JSON object where the provider supports it
+        json_mode: bool = True,
+        # Consume answers as token streams; aiter_updates reports each field as soon as it is complete
+        stream: bool = False,
+        # Send each path to the fast or the large model tier; failed fast answers are redone by the large model
+        routing: Optional[RoutingPolicy] = None,
+    ):
+        """Analyze timing paths with an LLM; the token counts of every call are kept in ``usage``"""
         self.api_key = api_key
-        self.model = self._initialize_model()
+        self.concurrency = concurrency
+        self.batch_tokens = batch_tokens
+        self.use_cache = use_cache
+        self.compact = compact
+        self.max_stages = max_stages if compact else None
+        self.encoding = "json" if not compact else f"compact/{max_stages}" if max_stages else "compact"
+        self.usage = TokenUsage()
+        self.json_mode = json_mode and MODEL_PROVIDER in JSON_MODE_PROVIDERS
+        self.stream = stream
+        self.routing = routing
         self.json_parser = JsonOutputParser()
 
-    def _initialize_model(self):
-        """Initialize the Groq model"""
-        os.environ["GROQ_API_KEY"] = self.api_key
+        # Chains and a scheduler per model tier; providers rate-limit each
+        # model separately, so every tier has its own per-key buckets
+        pooled = [key for key in dict.fromkeys(pool_keys or []) if key and key != api_key]
+        self.chains: Dict[str, Tuple[Any, Any, Any]] = {}
+        self.schedulers: Dict[str, RequestScheduler] = {}
+        for tier in ((TIER_FAST, TIER_LARGE) if routing else (TIER_LARGE,)):
+            clients = [self._build_chains(self._initialize_model(model_name=TIER_MODELS[tier]))]
+            clients += [self._build_chains(self._initialize_model(key, TIER_MODELS[tier])) for key in pooled]
+            self.chains[tier] = clients[0]
+            self.schedulers[tier] = RequestScheduler(clients, requests_per_minute, tokens_per_minute)
+
+    def _initialize_model(self, api_key: Optional[str] = None, model_name: str = MODEL_NAME):
+        """Initialize a Groq model (for a pooled key when ``api_key`` is given)"""
+        if api_key is None:
+            os.environ["GROQ_API_KEY"] = self.api_key
         return init_chat_model(
-            "llama-3.3-70b-versatile",
-            model_provider="groq",
-            temperature=0.1
+            model_name,
+            model_provider=MODEL_PROVIDER,
+            temperature=TEMPERATURE,
+            api_key=api_key or self.api_key
+        )
+
+    def _build_chains(self, model) -> Tuple[Any, Any, Any]:
+        """
+        The single-path, batched and repair prompt chains for one model. They
+        return the raw message so its token usage can be recorded before parsing.
+        """
+        if self.json_mode:
+            model = model.bind(response_format={"type": "json_object"})
+        return (
+            PromptTemplate.from_template(PROMPT_TEMPLATE) | model,
+            PromptTemplate.from_template(BATCH_PROMPT_TEMPLATE) | model,
+            PromptTemplate.from_template(REPAIR_PROMPT_TEMPLATE) | model,
         )
 
-    def analyze_paths(self, paths: List[TimingPath]) -> List[Dict[str, Any]]:
+    def analyze_paths(self, paths: List[PathRecord]) -> List[Dict[str, Any]]:
         """Analyze timing paths using LLM"""
         results = []
-        prompt_template = PromptTemplate.from_template(PROMPT_TEMPLATE)
-
         for i, path in enumerate(paths):
+            cached = self._cached(path)
+            if cached is not None:
+                results.append(cached)
+                continue
             try:
-                chain = prompt_template | self.model | self.json_parser
-                result = chain.invoke({"path_json": json.dumps(path.dict(), indent=2)})
+                tier, escalated = self._route(path)[0], False
+                response = self._invoke(path, tier)
+                if self._needs_escalation(path, tier, response):
+                    tier, escalated = TIER_LARGE, True
+                    response = self._invoke(path, tier)
+                results.append(self._complete(path, response, tier, escalated))
+            except Exception as e:
+                results.append(_failed_result(i, path, e))
+        return results
+
+    async def aanalyze_paths(self, paths: List[PathRecord]) -> List[Dict[str, Any]]:
+        """
+        Analyze timing paths with up to ``concurrency`` LLM requests in flight.
+
+        Results are returned in input order and a failing path only affects
+        its own result, as in analyze_paths.
+        """
+        results: Dict[int, Dict[str, Any]] = {}
+        async for i, result in self.aiter_analyses(paths):
+            results[i] = result
+        return [results[i] for i in range(len(paths))]
+
+    async def aiter_analyses(self, paths: List[PathRecord]) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(index, result)`` pairs as analyses complete.
+
+        Cached results come first. Requests are then started in priority
+        order (see priority_order), so the worst violations are answered first.
+        """
+        async for i, result, final in self.aiter_updates(paths):
+            if final:
+                yield i, result
 
-                # Ensure result has required fields
-                result.update({
-                    "startpoint": path.startpoint,
-                    "endpoint": path.endpoint,
-                    "path_type": path.path_type,
-                    "status": path.status,
-                    "slack": path.slack
-                })
+    async def aiter_updates(self, paths: List[PathRecord]) -> AsyncIterator[Tuple[int, Dict[str, Any], bool]]:
+        """
+        Yield ``(index, result, final)`` as analyses progress, in the order of aiter_analyses.
 
-                results.append(result)
+        In streaming mode a path's answer is also yielded with ``final=False``
+        each time another of its fields or suggestions has streamed in; every
+        path ends with exactly one final result.
+        """
+        pending = []
+        for i in priority_order(paths):
+            cached = self._cached(paths[i])
+            if cached is not None:
+                yield i, cached, True
+            else:
+                pending.append(i)
 
+        tiers = {i: self._route(paths[i])[0] for i in pending}
+        if self.batch_tokens:
+            # Batches never mix tiers; they are still started in priority order
+            units = []
+            for tier in self.chains:
+                members = [i for i in pending if tiers[i] == tier]
+                batches = pack_batches([paths[i] for i in members], self.batch_tokens, self.compact, self.max_stages)
+                units += [(tier, [members[k] for k in batch]) for batch in batches]
+            rank = {i: r for r, i in enumerate(pending)}
+            units.sort(key=lambda unit: rank[unit[1][0]])
+        else:
+            units = [(tiers[i], [i]) for i in pending]
+
+        # Partial and final results of all requests, in arrival order
+        updates: asyncio.Queue = asyncio.Queue()
+
+        def on_partial(i: int, result: Dict[str, Any]):
+            updates.put_nowait((i, result, False))
+
+        async def run(tier: str, unit: List[int]):
+            try:
+                results = await self._analyze_batch(
+                    [(i, paths[i]) for i in unit], semaphore, on_partial if self.stream else None, tier
+                )
+            except Exception as e:
+                results = {i: _failed_result(i, paths[i], e) for i in unit}
+            for i, result in results.items():
+                updates.put_nowait((i, result, True))
+
+        # The semaphore admits waiting tasks first-come first-served, i.e. in priority order
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        tasks = [asyncio.ensure_future(run(tier, unit)) for tier, unit in units]
+        try:
+            remaining = len(pending)
+            while remaining:
+                i, result, final = await updates.get()
+                remaining -= final
+                yield i, result, final
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _ainvoke(
+        self,
+        chain: Any,
+        inputs: Dict[str, str],
+        on_fields: Optional[Callable[[Dict[str, Any]], None]] = None,
+        array_fields: Iterable[str] = (),
+    ) -> Any:
+        """
+        Invoke a chain. With ``on_fields``, consume its token stream instead,
+        calling it with the completed fields whenever another one (or another
+        element of ``array_fields``) is complete; returns the whole message.
+        """
+        if on_fields is None:
+            return await chain.ainvoke(inputs)
+        parser = StreamingJSONObject(array_fields)
+        message = None
+        async for chunk in chain.astream(inputs):
+            message = chunk if message is None else message + chunk
+            if isinstance(chunk.content, str) and parser.feed(chunk.content):
+                on_fields(parser.partial())
+        return message
+
+    def _route(self, path: PathRecord) -> Tuple[str, str]:
+        """The path's model tier and the reason for it"""
+        if self.routing is None:
+            return TIER_LARGE, "routing off"
+        return self.routing.route(path)
+
+    def _routed(self, path: PathRecord, result: Dict[str, Any], tier: str, escalated: bool) -> Dict[str, Any]:
+        """Record which model answered and why"""
+        if self.routing is not None:
+            result["routing"] = {
+                "model": TIER_MODELS[tier],
+                "tier": tier,
+                "reason": self._route(path)[1],
+                "escalated": escalated,
+                "thresholds": self.routing.thresholds(),
+            }
+        return result
+
+    def _needs_escalation(self, path: PathRecord, tier: str, response: Any) -> bool:
+        """Whether a fast-model answer failed validation and must be redone by the large model"""
+        if tier != TIER_FAST:
+            return False
+        return bool(validate_analysis(_path_result(path, dict(response) if isinstance(response, dict) else {}))[1])
+
+    def _cache_key(self, path: PathRecord) -> str:
+        # Keyed by the routed model, so escalated answers are reused for the path too
+        return analysis_key(path.dict(), TIER_MODELS[self._route(path)[0]], TEMPERATURE, self.encoding)
+
+    def _prompt_inputs(self, path: PathRecord) -> Dict[str, str]:
+        return {"path_format": _path_format(self.compact), "path": encode_path(path, self.compact, self.max_stages)}
+
+    def _batch_inputs(self, batch: List[Tuple[int, PathRecord]]) -> Dict[str, str]:
+        return {
+            "path_format": _path_format(self.compact),
+            "paths": "\n".join(
+                encode_batch_entry(k, path, self.compact, self.max_stages) for k, (_, path) in enumerate(batch)
+            ),
+        }
+
+    def _parse(self, message: Any, kind: str, tier: str, paths: int, estimated_prompt_tokens: int) -> Any:
+        """Record the call's token usage, then parse the JSON out of the response (None if there is none)"""
+        self.usage.record(kind, TIER_MODELS[tier], paths, self.encoding, estimated_prompt_tokens, message)
+        try:
+            return self.json_parser.invoke(message)
+        except Exception as e:
+            print(f"Unparseable {kind} response: {e}")
+            return None
+
+    def _repair_inputs(self, path: PathRecord, result: Dict[str, Any], problems: Dict[str, str]) -> Dict[str, str]:
+        return {**self._prompt_inputs(path), **repair_inputs(result, problems)}
+
+    def _invoke(self, path: PathRecord, tier: str) -> Any:
+        """Run the single-path prompt on a tier's model and parse the answer"""
+        inputs = self._prompt_inputs(path)
+        message = self.chains[tier][0].invoke(inputs)
+        return self._parse(message, "path", tier, 1, estimate_tokens(PROMPT_TEMPLATE + "".join(inputs.values())))
+
+    def _complete(self, path: PathRecord, response: Any, tier: str, escalated: bool = False) -> Dict[str, Any]:
+        """Validate a path's LLM answer, repairing missing or invalid fields, and finish it"""
+        result = _path_result(path, response if isinstance(response, dict) else {})
+        for attempt in range(MAX_REPAIR_ATTEMPTS + 1):
+            fields, problems = validate_analysis(result)
+            if not problems or attempt == MAX_REPAIR_ATTEMPTS:
+                break
+            inputs = self._repair_inputs(path, result, problems)
+            prompt_tokens = estimate_tokens(REPAIR_PROMPT_TEMPLATE + "".join(inputs.values()))
+            try:
+                repair = self._parse(self.chains[tier][2].invoke(inputs), "repair", tier, 1, prompt_tokens)
             except Exception as e:
-                print(f"Error analyzing path {i}: {e}")
-                # Create a basic result for failed analysis
-                results.append({
-                    "startpoint": path.startpoint,
-                    "endpoint": path.endpoint,
-                    "path_type": path.path_type,
-                    "status": path.status,
-                    "slack": path.slack,
-                    "root_cause": f"Analysis failed: {str(e)}",
-                    "severity": "unknown",
-                    "suggestions": [],
-                    "estimated_effort": "unknown"
-                })
-
-        return results
\ No newline at end of file
+                print(f"Error repairing analysis of {path.startpoint} -> {path.endpoint}: {e}")
+                break
+            result = merge_repair(result, repair, problems)
+        return self._validated(path, self._routed(path, result, tier, escalated), fields, problems)
+
+    async def _acomplete(
+        self,
+        path: PathRecord,
+        response: Any,
+        semaphore: asyncio.Semaphore,
+        tier: str,
+        escalated: bool = False,
+    ) -> Dict[str, Any]:
+        """_complete, with the repair requests scheduled like any other"""
+        result = _path_result(path, response if isinstance(response, dict) else {})
+        for attempt in range(MAX_REPAIR_ATTEMPTS + 1):
+            fields, problems = validate_analysis(result)
+            if not problems or attempt == MAX_REPAIR_ATTEMPTS:
+                break
+            inputs = self._repair_inputs(path, result, problems)
+            prompt_tokens = estimate_tokens(REPAIR_PROMPT_TEMPLATE + "".join(inputs.values()))
+            try:
+                async with semaphore:
+                    message = await self.schedulers[tier].run(
+                        lambda chains: chains[2].ainvoke(inputs),
+                        prompt_tokens + RESPONSE_TOKENS_PER_REPAIR_FIELD * len(problems)
+                    )
+            except Exception as e:
+                print(f"Error repairing analysis of {path.startpoint} -> {path.endpoint}: {e}")
+                break
+            result = merge_repair(result, self._parse(message, "repair", tier, 1, prompt_tokens), problems)
+        return self._validated(path, self._routed(path, result, tier, escalated), fields, problems)
+
+    def _validated(
+        self,
+        path: PathRecord,
+        result: Dict[str, Any],
+        fields: Dict[str, Any],
+        problems: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Finish a valid result; fill the fields still invalid with failure markers (and don't cache it)"""
+        if not problems:
+            result.update(fields)
+            return self._finish(path, result)
+        print(f"Analysis of {path.startpoint} -> {path.endpoint} still invalid after repair: {', '.join(problems)}")
+        result.update({field: _FAILED_FIELDS[field] for field in problems if field in _FAILED_FIELDS})
+        if "root_cause" in problems:
+            result["root_cause"] = f"Analysis incomplete: {problems['root_cause']}"
+        return result
+
+    def _cached(self, path: PathRecord) -> Optional[Dict[str, Any]]:
+        """The cached analysis of a path, unless the cache is bypassed"""
+        if not self.use_cache:
+            return None
+        result = load_analysis(self._cache_key(path))
+        return _path_result(path, result) if result is not None else None
+
+    def _finish(self, path: PathRecord, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete a fresh LLM result and write it to the analysis cache"""
+        result = _path_result(path, result)
+        store_analysis(self._cache_key(path), result)
+        return result
+
+    async def _analyze_one(
+        self,
+        i: int,
+        path: PathRecord,
+        semaphore: asyncio.Semaphore,
+        on_partial: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        tier: str = TIER_LARGE,
+        escalated: bool = False,
+    ) -> Dict[str, Any]:
+        on_fields = None if on_partial is None else lambda fields: on_partial(i, _path_result(path, fields))
+        try:
+            inputs = self._prompt_inputs(path)
+            prompt_tokens = estimate_tokens(PROMPT_TEMPLATE + "".join(inputs.values()))
+            async with semaphore:
+                try:
+                    message = await self.schedulers[tier].run(
+                        lambda chains: self._ainvoke(chains[0], inputs, on_fields, ("suggestions",)),
+                        prompt_tokens + RESPONSE_TOKENS_PER_PATH
+                    )
+                    response = self._parse(message, "path", tier, 1, prompt_tokens)
+                except Exception as e:
+                    # In JSON mode the provider rejects output that is not valid JSON;
+                    # repair that like an empty answer instead of failing the path
+                    if not is_json_validation_error(e):
+                        raise
+                    response = None
+            if self._needs_escalation(path, tier, response):
+                return await self._analyze_one(i, path, semaphore, on_partial, TIER_LARGE, escalated=True)
+            return await self._acomplete(path, response, semaphore, tier, escalated)
+        except Exception as e:
+            return _failed_result(i, path, e)
+
+    async def _analyze_batch(
+        self,
+        batch: List[Tuple[int, PathRecord]],
+        semaphore: asyncio.Semaphore,
+        on_partial: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        tier: str = TIER_LARGE,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Analyze several paths in one request.
+
+        Paths whose entries are missing or malformed in the response (or all
+        of them, if the request fails) are split into two halves and retried;
+        a single remaining path falls back to the one-path prompt. When
+        streaming, each path's entry is reported as soon as it is complete.
+        Fast-tier entries that fail validation are redone one by one by the
+        large model.
+        """
+        if len(batch) == 1:
+            i, path = batch[0]
+            return {i: await self._analyze_one(i, path, semaphore, on_partial, tier)}
+
+        on_fields = None
+        if on_partial is not None:
+            reported = set()
+
+            def on_fields(fields: Dict[str, Any]):
+                for k, entry in _batch_entries(fields, len(batch)).items():
+                    if k not in reported:
+                        reported.add(k)
+                        on_partial(batch[k][0], _path_result(batch[k][1], entry))
+
+        response = None
+        async with semaphore:
+            try:
+                inputs = self._batch_inputs(batch)
+                prompt_tokens = estimate_tokens(BATCH_PROMPT_TEMPLATE + "".join(inputs.values()))
+                message = await self.schedulers[tier].run(
+                    lambda chains: self._ainvoke(chains[1], inputs, on_fields, ("analyses",)),
+                    prompt_tokens + RESPONSE_TOKENS_PER_PATH * len(batch)
+                )
+                response = self._parse(message, "batch", tier, len(batch), prompt_tokens)
+            except Exception as e:
+                print(f"Error analyzing batch of {len(batch)} paths: {e}")
+
+        entries = _batch_entries(response, len(batch))
+        answered = [(k, i, path) for k, (i, path) in enumerate(batch) if k in entries]
+        retry = [(i, path) for k, (i, path) in enumerate(batch) if k not in entries]
+
+        # Answered paths only have their invalid fields repaired (or are escalated)
+        completed = await asyncio.gather(*(
+            self._analyze_one(i, path, semaphore, on_partial, TIER_LARGE, escalated=True)
+            if self._needs_escalation(path, tier, entries[k])
+            else self._acomplete(path, entries[k], semaphore, tier)
+            for k, i, path in answered
+        ), return_exceptions=True)
+        results = {}
+        for (_, i, path), result in zip(answered, completed):
+            results[i] = _failed_result(i, path, result) if isinstance(result, Exception) else result
+
+        if retry:
+            half = (len(retry) + 1) // 2
+            for sub_results in await asyncio.gather(*(
+                self._analyze_batch(part, semaphore, on_partial, tier) for part in (retry[:half], retry[half:]) if part
+            )):
+                results.update(sub_results)
+        return results
+
+
+def priority_order(paths: List[PathRecord]) -> List[int]:
+    """
+    Path indices, most urgent first: violations before met paths, then most
+    negative slack, then deepest logic chain (more stages to restructure).
+    """
+    def urgency(i: int):
+        path = paths[i]
+        slack = path.slack if path.slack is not None else float("inf")
+        return (path.status != "VIOLATED", slack, -len(path.logic_chain))
+
+    return sorted(range(len(paths)), key=urgency)
+
+
+def pack_batches(
+    paths: List[PathRecord],
+    budget: int,
+    compact: bool = True,
+    max_stages: Optional[int] = None,
+) -> List[List[int]]:
+    """
+    Greedily pack path indices, in order, into batches whose estimated prompt
+    (batch template plus one encoded entry per path) fits within ``budget`` tokens.
+
+    A path too large for the budget on its own still gets a batch of one.
+    """
+    available = budget - estimate_tokens(BATCH_PROMPT_TEMPLATE + _path_format(compact))
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    used = 0
+    for i, path in enumerate(paths):
+        tokens = estimate_tokens(encode_batch_entry(len(batch), path, compact, max_stages))
+        if batch and (used + tokens > available or len(batch) >= MAX_BATCH_PATHS):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(i)
+        used += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _path_format(compact: bool) -> str:
+    return COMPACT_PATH_FORMAT if compact else JSON_PATH_FORMAT
+
+
+def _batch_entries(response: Any, size: int) -> Dict[int, Dict[str, Any]]:
+    """Entries of a batch response with a valid index, keyed by that index within the batch"""
+    if isinstance(response, dict):
+        # The batch prompt asks for the array wrapped in an object
+        response = next((value for value in response.values() if isinstance(value, list)), None)
+    if not isinstance(response, list):
+        return {}
+
+    entries = {}
+    for entry in response:
+        if not isinstance(entry, dict):
+            continue
+        entry = dict(entry)
+        try:
+            index = int(entry.pop("index"))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < size and index not in entries:
+            entries[index] = entry
+    return entries
+
+
+def is_json_validation_error(error: Exception) -> bool:
+    """Whether the provider rejected a JSON-mode generation that was not valid JSON"""
+    return "json_validate_failed" in str(error)
+
+
+def _path_result(path: PathRecord, result: Dict[str, Any]) -> Dict[str, Any]:
+    # Ensure result has required fields
+    result.update({
+        "startpoint": path.startpoint,
+        "endpoint": path.endpoint,
+        "path_type": path.path_type,
+        "status": path.status,
+        "slack": path.slack,
+        "corner": path.corner
+    })
+    return result
+
+
+def _failed_result(i: int, path: PathRecord, error: Exception) -> Dict[str, Any]:
+    print(f"Error analyzing path {i}: {error}")
+    # Create a basic result for failed analysis
+    return {
+        "startpoint": path.startpoint,
+        "endpoint": path.endpoint,
+        "path_type": path.path_type,
+        "status": path.status,
+        "slack": path.slack,
+        "corner": path.corner,
+        "root_cause": f"Analysis failed: {str(error)}",
+        "severity": "unknown",
+        "suggestions": [],
+        "estimated_effort": "unknown"
+    }
@@ -0,0 +1,118 @@
+import json
+from typing import List, Dict, Any, Optional, Iterable
+
+_WHITESPACE = " \t\r\n"
+
+
+class StreamingJSONObject:
+    """
+    Incremental parser for a JSON object arriving in pieces (a token stream).
+
+    Each ``feed`` scans only the new text, tracking nesting and strings, and
+    decodes every top-level field as soon as its value is complete. Elements
+    of the ``array_fields`` are decoded one by one as each is complete, before
+    the array itself closes. Text before the opening brace (e.g. a Markdown
+    code fence) is skipped.
+    """
+
+    def __init__(self, array_fields: Iterable[str] = ()):
+        self.array_fields = set(array_fields)
+        self.fields: Dict[str, Any] = {}
+        self.items: Dict[str, List[Any]] = {}
+        self.closed = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, text: str) -> bool:
+        """Consume more of the response; True if a field or array element was completed"""
+        if self.closed or not text:
+            return False
+        self._buffer += text
+        completed = False
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None:
+                        self._key = json.loads(buffer[self._key_start:pos + 1])
+                        self._key_start = None
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if self._depth == 1 and self._key is not None and self._value_start is None and char not in _WHITESPACE + ":":
+                self._value_start = pos
+            if self._depth == 2 and self._item_start is None and self._in_array() and char not in _WHITESPACE + ",]":
+                self._item_start = pos
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = pos
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 2 and char == "[" and self._key in self.array_fields:
+                    self.items.setdefault(self._key, [])
+            elif char in "}]":
+                if self._depth == 2 and char == "]" and self._in_array():
+                    completed |= self._end_item(pos)
+                self._depth -= 1
+                if self._depth == 0:
+                    completed |= self._end_field(pos)
+                    self.closed = True
+                    self._pos = pos + 1
+                    return completed
+            elif char == ",":
+                if self._depth == 1:
+                    completed |= self._end_field(pos)
+                elif self._depth == 2 and self._in_array():
+                    completed |= self._end_item(pos)
+        self._pos = len(buffer)
+        return completed
+
+    def partial(self) -> Dict[str, Any]:
+        """The completed fields, with array fields still streaming holding their completed elements"""
+        partial = dict(self.fields)
+        for field, items in self.items.items():
+            partial.setdefault(field, list(items))
+        return partial
+
+    def _in_array(self) -> bool:
+        return self._key in self.items and self._key not in self.fields
+
+    def _end_item(self, pos: int) -> bool:
+        start, self._item_start = self._item_start, None
+        if start is None:
+            return False
+        try:
+            self.items[self._key].append(json.loads(self._buffer[start:pos]))
+        except ValueError:
+            return False
+        return True
+
+    def _end_field(self, pos: int) -> bool:
+        key, start = self._key, self._value_start
+        self._key = self._value_start = None
+        if key is None or start is None:
+            return False
+        try:
+            self.fields[key] = json.loads(self._buffer[start:pos])
+        except ValueError:
+            return False
+        return True
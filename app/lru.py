@@ -0,0 +1,19 @@
+from typing import List, Any, Sequence, Tuple
+
+
+def lru_evictions(entries: Sequence[Tuple[Any, int]], max_bytes: int, keep: int = 0) -> List[Any]:
+    """
+    Keys to evict so a size-bounded cache fits in ``max_bytes``.
+
+    ``entries`` are (key, size) pairs ordered least recently used first;
+    reading an entry must refresh its position for this to be LRU. The
+    ``keep`` most recent entries are never evicted.
+    """
+    total = sum(size for _, size in entries)
+    evicted = []
+    for key, size in entries[:len(entries) - keep]:
+        if total <= max_bytes:
+            break
+        evicted.append(key)
+        total -= size
+    return evicted
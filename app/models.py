@@ -1,5 +1,6 @@
+import re
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 class TimingPath(BaseModel):
     startpoint: str
@@ -11,6 +12,7 @@ class TimingPath(BaseModel):
     slack: Optional[float] = None
     status: str
     logic_chain: List[Dict[str, Any]]
+    corner: str = ""
 
 class AnalysisSuggestion(BaseModel):
     fix: str
@@ -33,4 +35,150 @@ class AnalysisReport(BaseModel):
     total_paths: int
     violated_paths: int
     analyses: List[ViolationAnalysis]
-    summary: Dict[str, Any]
\ No newline at end of file
+    summary: Dict[str, Any]
+
+# One logic-chain stage as produced by the parser: (cell, delay)
+Stage = Tuple[str, float]
+
+# Library cell of a logic-chain stage: the last parenthesized word, e.g. "(BUF_X1)"
+_CELL_TYPE = re.compile(r"\(([^()]*)\)\s*$")
+
+# One row of a path's Delay/Time table: (segment, kind, edge, delay, time, description).
+# description is the Description column as printed, including any ^/v edge mark;
+# delay is None for rows that only report a time (e.g. the capture clock pin).
+TimingPoint = Tuple[int, int, int, Optional[float], float, str]
+
+# TimingPoint segments: launch clock, data path, capture clock / required time
+SEGMENT_LAUNCH = 0
+SEGMENT_DATA = 1
+SEGMENT_CAPTURE = 2
+
+# TimingPoint kinds
+POINT_PIN = 0
+POINT_CLOCK_EDGE = 1
+POINT_CLOCK_NETWORK = 2
+POINT_CLOCK_RECONVERGENCE = 3
+POINT_CLOCK_UNCERTAINTY = 4
+POINT_EXTERNAL_DELAY = 5
+POINT_LIBRARY = 6
+
+# TimingPoint edges
+EDGE_NONE = 0
+EDGE_RISE = 1
+EDGE_FALL = 2
+
+# Per-path clock and constraint quantities derived from the timing points,
+# as (name, segment, kind); values are summed over matching points.
+CLOCK_SUMMARY_TERMS = (
+    ("launch_clock_latency", SEGMENT_LAUNCH, POINT_CLOCK_NETWORK),
+    ("capture_clock_latency", SEGMENT_CAPTURE, POINT_CLOCK_NETWORK),
+    ("clock_reconvergence_pessimism", SEGMENT_CAPTURE, POINT_CLOCK_RECONVERGENCE),
+    ("clock_uncertainty", SEGMENT_CAPTURE, POINT_CLOCK_UNCERTAINTY),
+    ("library_time", SEGMENT_CAPTURE, POINT_LIBRARY),
+    ("input_external_delay", SEGMENT_DATA, POINT_EXTERNAL_DELAY),
+    ("output_external_delay", SEGMENT_CAPTURE, POINT_EXTERNAL_DELAY),
+)
+
+
+class PathRecord:
+    """
+    Lightweight, unvalidated counterpart of TimingPath used on the parser hot path.
+
+    Records expose the same attributes and ``.dict()`` output as TimingPath.
+    Pydantic validation is deferred to trust boundaries via ``to_model()``.
+    """
+    __slots__ = (
+        "startpoint", "endpoint", "clock", "path_type", "data_arrival_time",
+        "data_required_time", "slack", "status", "logic_chain", "timing_points", "corner",
+    )
+
+    def __init__(
+        self,
+        startpoint: str,
+        endpoint: str,
+        clock: str,
+        path_type: str,
+        data_arrival_time: Optional[float] = None,
+        data_required_time: Optional[float] = None,
+        slack: Optional[float] = None,
+        status: str = "MET",
+        logic_chain: Optional[List[Stage]] = None,
+        timing_points: Optional[List[TimingPoint]] = None,
+        corner: str = "",
+    ):
+        self.startpoint = startpoint
+        self.endpoint = endpoint
+        self.clock = clock
+        self.path_type = path_type
+        self.data_arrival_time = data_arrival_time
+        self.data_required_time = data_required_time
+        self.slack = slack
+        self.status = status
+        self.logic_chain = logic_chain if logic_chain is not None else []
+        self.timing_points = timing_points if timing_points is not None else []
+        self.corner = corner
+
+    @classmethod
+    def from_model(cls, path: TimingPath) -> "PathRecord":
+        data = path.dict()
+        data["logic_chain"] = [(stage["cell"], stage["delay"]) for stage in data["logic_chain"]]
+        return cls(**data)
+
+    def to_model(self) -> TimingPath:
+        """Validate the record into a TimingPath"""
+        return TimingPath(**self.dict())
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "startpoint": self.startpoint,
+            "endpoint": self.endpoint,
+            "clock": self.clock,
+            "path_type": self.path_type,
+            "data_arrival_time": self.data_arrival_time,
+            "data_required_time": self.data_required_time,
+            "slack": self.slack,
+            "status": self.status,
+            "logic_chain": [{"cell": cell, "delay": delay} for cell, delay in self.logic_chain],
+            "corner": self.corner,
+        }
+
+    def clock_summary(self) -> Dict[str, float]:
+        """Clock latencies, skew, uncertainty and external-delay budget from the timing points"""
+        return clock_summary(self.timing_points)
+
+    def json(self, **kwargs) -> str:
+        return self.to_model().json(**kwargs)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PathRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"PathRecord({self.startpoint!r} -> {self.endpoint!r}, slack={self.slack}, status={self.status!r})"
+
+
+def clock_summary(timing_points: List[TimingPoint]) -> Dict[str, float]:
+    """
+    Summarize one path's timing points.
+
+    Besides the CLOCK_SUMMARY_TERMS sums, ``clock_skew`` is capture minus
+    launch clock latency and ``external_delay`` is the I/O budget taken by
+    set_input_delay / set_output_delay (output delay counted by magnitude,
+    since reports print it negative on setup paths).
+    """
+    summary = {name: 0.0 for name, _, _ in CLOCK_SUMMARY_TERMS}
+    terms = {(segment, kind): name for name, segment, kind in CLOCK_SUMMARY_TERMS}
+    for segment, kind, _, delay, _, _ in timing_points:
+        name = terms.get((segment, kind))
+        if name is not None and delay is not None:
+            summary[name] += delay
+    summary["clock_skew"] = summary["capture_clock_latency"] - summary["launch_clock_latency"]
+    summary["external_delay"] = summary["input_external_delay"] + abs(summary["output_external_delay"])
+    return summary
+
+
+def stage_cell_type(cell: str) -> str:
+    """Library cell of a logic-chain stage description, e.g. "BUF_X1" for "v u1/Z (BUF_X1)" """
+    match = _CELL_TYPE.search(cell)
+    return match.group(1) if match else ""
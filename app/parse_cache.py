@@ -0,0 +1,145 @@
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, IO, Union
+
+from app.lru import lru_evictions
+from app.path_table import TimingPathTable
+from app.utils import PARSER_VERSION, PageReleaser
+
+# Parsed reports are cached here as .npz archives named by content digest
+CACHE_DIR = Path(__file__).parent.parent / "models" / "parse_cache"
+STATS_FILE = CACHE_DIR / "stats.json"
+
+# Total size of cached entries before least-recently-used ones are evicted
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+
+def _ensure_cache_dir():
+    """Ensure the cache directory and stats file exist"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    if not STATS_FILE.exists():
+        with open(STATS_FILE, 'w') as f:
+            json.dump({"hits": 0, "misses": 0}, f, indent=2)
+
+
+# Reports are hashed in chunks of this size
+_DIGEST_CHUNK = 1024 * 1024
+
+
+def report_digest(fileobj: Union[IO, mmap.mmap], options: Optional[Dict[str, Any]] = None) -> str:
+    """Hash the report bytes (read in chunks) with the parser version and filter options"""
+    digest = hashlib.sha256(f"sta-parser-{PARSER_VERSION}\n".encode())
+    digest.update(json.dumps(options or {}, sort_keys=True).encode())
+    if isinstance(fileobj, mmap.mmap):
+        # Hashed pages are released as we go, or the whole mapping would stay resident
+        pages = PageReleaser(fileobj)
+        for pos in range(0, len(fileobj), _DIGEST_CHUNK):
+            digest.update(fileobj[pos:pos + _DIGEST_CHUNK])
+            pages.advance(pos + _DIGEST_CHUNK)
+        pages.finish()
+        return digest.hexdigest()
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(_DIGEST_CHUNK)
+        if not chunk:
+            break
+        digest.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _entry_path(digest: str) -> Path:
+    return CACHE_DIR / f"{digest}.npz"
+
+
+def load_table(digest: str) -> Optional[TimingPathTable]:
+    """Return the cached table for a digest, or None on a miss"""
+    _ensure_cache_dir()
+    entry = _entry_path(digest)
+    table = None
+    if entry.exists():
+        try:
+            table = TimingPathTable.load(entry)
+            os.utime(entry)
+        except Exception as e:
+            print(f"Error reading parse cache entry {digest}: {e}")
+            entry.unlink(missing_ok=True)
+
+    _record_lookup(hit=table is not None)
+    return table
+
+
+def store_table(digest: str, table: TimingPathTable, max_bytes: int = MAX_CACHE_BYTES) -> bool:
+    """Write a parsed table to the cache and evict old entries beyond max_bytes"""
+    _ensure_cache_dir()
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            table.save(f)
+        os.replace(tmp_path, _entry_path(digest))
+    except Exception as e:
+        print(f"Error writing parse cache entry {digest}: {e}")
+        return False
+
+    _evict(max_bytes)
+    return True
+
+
+def _evict(max_bytes: int):
+    """Delete least-recently-used entries until the cache fits in max_bytes"""
+    # Loads touch entries, so modification time orders them by last use
+    entries = sorted(CACHE_DIR.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+    # The newest entry (the one just stored) is always kept
+    for entry in lru_evictions([(p, p.stat().st_size) for p in entries], max_bytes, keep=1):
+        entry.unlink(missing_ok=True)
+
+
+def _record_lookup(hit: bool):
+    try:
+        with open(STATS_FILE, 'r') as f:
+            stats = json.load(f)
+        stats["hits" if hit else "misses"] = stats.get("hits" if hit else "misses", 0) + 1
+        with open(STATS_FILE, 'w') as f:
+            json.dump(stats, f, indent=2)
+    except Exception as e:
+        print(f"Error updating parse cache stats: {e}")
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counts, hit rate, entry count and total size (admin only)"""
+    _ensure_cache_dir()
+    try:
+        with open(STATS_FILE, 'r') as f:
+            stats = json.load(f)
+    except Exception as e:
+        print(f"Error reading parse cache stats: {e}")
+        stats = {}
+
+    hits = stats.get("hits", 0)
+    misses = stats.get("misses", 0)
+    entries = list(CACHE_DIR.glob("*.npz"))
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "entries": len(entries),
+        "size_bytes": sum(p.stat().st_size for p in entries),
+    }
+
+
+def clear_cache() -> bool:
+    """Delete all cached entries and reset the counters (admin only)"""
+    _ensure_cache_dir()
+    try:
+        for entry in CACHE_DIR.glob("*.npz"):
+            entry.unlink(missing_ok=True)
+        with open(STATS_FILE, 'w') as f:
+            json.dump({"hits": 0, "misses": 0}, f, indent=2)
+        return True
+    except Exception as e:
+        print(f"Error clearing parse cache: {e}")
+        return False
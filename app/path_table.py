@@ -0,0 +1,365 @@
+from array import array
+from typing import List, Dict, Optional, Iterator, Iterable, Union, BinaryIO
+
+import numpy as np
+
+from app.models import PathRecord, CLOCK_SUMMARY_TERMS
+
+# Status codes stored in TimingPathTable.status
+STATUS_MET = 0
+STATUS_VIOLATED = 1
+STATUS_NAMES = ("MET", "VIOLATED")
+
+
+class StringPool:
+    """Interns strings to dense integer ids"""
+
+    def __init__(self, values: Optional[Iterable[str]] = None):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for value in values or ():
+            self.intern(value)
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self._ids[value] = string_id
+            self.values.append(value)
+        return string_id
+
+    def lookup(self, value: str) -> int:
+        """Return the id of a string, or -1 if it was never interned"""
+        return self._ids.get(value, -1)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.values[string_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class TimingPathTable:
+    """
+    Columnar storage for parsed timing paths.
+
+    Per-path fields are NumPy columns (missing times are NaN, strings are ids
+    into a shared StringPool) and logic-chain stages are stored CSR-style:
+    the stages of path ``i`` are ``stage_delay[stage_offsets[i]:stage_offsets[i + 1]]``.
+    Timing points (every Delay/Time row, tagged with segment, kind and edge)
+    are stored the same way under ``point_offsets``.
+    Rows convert lazily to PathRecord objects for existing callers.
+    """
+
+    def __init__(
+        self,
+        strings: StringPool,
+        startpoint: np.ndarray,
+        endpoint: np.ndarray,
+        clock: np.ndarray,
+        path_type: np.ndarray,
+        data_arrival_time: np.ndarray,
+        data_required_time: np.ndarray,
+        slack: np.ndarray,
+        status: np.ndarray,
+        stage_offsets: np.ndarray,
+        stage_delay: np.ndarray,
+        stage_cell: np.ndarray,
+        point_offsets: np.ndarray,
+        point_segment: np.ndarray,
+        point_kind: np.ndarray,
+        point_edge: np.ndarray,
+        point_delay: np.ndarray,
+        point_time: np.ndarray,
+        point_description: np.ndarray,
+        corner: np.ndarray,
+    ):
+        self.strings = strings
+        self.startpoint = startpoint
+        self.endpoint = endpoint
+        self.clock = clock
+        self.path_type = path_type
+        self.data_arrival_time = data_arrival_time
+        self.data_required_time = data_required_time
+        self.slack = slack
+        self.status = status
+        self.stage_offsets = stage_offsets
+        self.stage_delay = stage_delay
+        self.stage_cell = stage_cell
+        self.point_offsets = point_offsets
+        self.point_segment = point_segment
+        self.point_kind = point_kind
+        self.point_edge = point_edge
+        self.point_delay = point_delay
+        self.point_time = point_time
+        self.point_description = point_description
+        self.corner = corner
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[PathRecord]) -> "TimingPathTable":
+        builder = TimingPathTableBuilder()
+        for path in paths:
+            builder.add(path)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def __iter__(self) -> Iterator[PathRecord]:
+        for i in range(len(self)):
+            yield self.path(i)
+
+    def __getitem__(self, i: int) -> PathRecord:
+        return self.path(i)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns (excluding the string pool)"""
+        return sum(column.nbytes for column in self._columns().values())
+
+    def path(self, i: int) -> PathRecord:
+        """Materialize row ``i`` as a PathRecord"""
+        if i < 0:
+            i += len(self)
+        strings = self.strings
+        start, end = self.stage_offsets[i], self.stage_offsets[i + 1]
+        logic_chain = [
+            (strings[cell], delay)
+            for cell, delay in zip(self.stage_cell[start:end].tolist(), self.stage_delay[start:end].tolist())
+        ]
+        start, end = self.point_offsets[i], self.point_offsets[i + 1]
+        timing_points = [
+            (segment, kind, edge, optional_float(delay), time, strings[description])
+            for segment, kind, edge, delay, time, description in zip(
+                self.point_segment[start:end].tolist(),
+                self.point_kind[start:end].tolist(),
+                self.point_edge[start:end].tolist(),
+                self.point_delay[start:end].tolist(),
+                self.point_time[start:end].tolist(),
+                self.point_description[start:end].tolist(),
+            )
+        ]
+        return PathRecord(
+            startpoint=strings[self.startpoint[i]],
+            endpoint=strings[self.endpoint[i]],
+            clock=strings[self.clock[i]],
+            path_type=strings[self.path_type[i]],
+            data_arrival_time=optional_float(self.data_arrival_time[i]),
+            data_required_time=optional_float(self.data_required_time[i]),
+            slack=optional_float(self.slack[i]),
+            status=STATUS_NAMES[self.status[i]],
+            logic_chain=logic_chain,
+            timing_points=timing_points,
+            corner=strings[self.corner[i]],
+        )
+
+    def to_paths(self) -> List[PathRecord]:
+        return list(self)
+
+    def violated_mask(self) -> np.ndarray:
+        return self.status == STATUS_VIOLATED
+
+    def path_type_mask(self, path_type: str) -> np.ndarray:
+        return self.path_type == self.strings.lookup(path_type)
+
+    def stage_counts(self) -> np.ndarray:
+        return np.diff(self.stage_offsets)
+
+    def clock_summary(self) -> Dict[str, np.ndarray]:
+        """Per-path clock latencies, skew, uncertainty and external-delay budget (see models.clock_summary)"""
+        rows = np.repeat(np.arange(len(self)), np.diff(self.point_offsets))
+        delay = np.nan_to_num(self.point_delay)
+        summary = {}
+        for name, segment, kind in CLOCK_SUMMARY_TERMS:
+            mask = (self.point_segment == segment) & (self.point_kind == kind)
+            summary[name] = np.bincount(rows[mask], weights=delay[mask], minlength=len(self)).astype(np.float64)
+        summary["clock_skew"] = summary["capture_clock_latency"] - summary["launch_clock_latency"]
+        summary["external_delay"] = summary["input_external_delay"] + np.abs(summary["output_external_delay"])
+        return summary
+
+    def select(self, rows: Union[np.ndarray, List[int]]) -> "TimingPathTable":
+        """Return a new table holding the given rows (boolean mask or indices)"""
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64, copy=False)
+        offsets, stage_index = _take_ranges(self.stage_offsets, rows)
+        point_offsets, point_index = _take_ranges(self.point_offsets, rows)
+
+        return TimingPathTable(
+            strings=self.strings,
+            startpoint=self.startpoint[rows],
+            endpoint=self.endpoint[rows],
+            clock=self.clock[rows],
+            path_type=self.path_type[rows],
+            data_arrival_time=self.data_arrival_time[rows],
+            data_required_time=self.data_required_time[rows],
+            slack=self.slack[rows],
+            status=self.status[rows],
+            stage_offsets=offsets,
+            stage_delay=self.stage_delay[stage_index],
+            stage_cell=self.stage_cell[stage_index],
+            point_offsets=point_offsets,
+            point_segment=self.point_segment[point_index],
+            point_kind=self.point_kind[point_index],
+            point_edge=self.point_edge[point_index],
+            point_delay=self.point_delay[point_index],
+            point_time=self.point_time[point_index],
+            point_description=self.point_description[point_index],
+            corner=self.corner[rows],
+        )
+
+    def save(self, fileobj: Union[str, BinaryIO]):
+        """Write the table to an uncompressed .npz archive"""
+        strings = "\0".join(self.strings.values).encode("utf-8")
+        np.savez(
+            fileobj,
+            string_data=np.frombuffer(strings, dtype=np.uint8),
+            string_count=np.array([len(self.strings)], dtype=np.int64),
+            **self._columns(),
+        )
+
+    @classmethod
+    def load(cls, fileobj: Union[str, BinaryIO]) -> "TimingPathTable":
+        """Read a table written by save()"""
+        with np.load(fileobj) as data:
+            columns = {name: data[name] for name in data.files}
+        count = int(columns.pop("string_count")[0])
+        strings = columns.pop("string_data").tobytes().decode("utf-8")
+        values = strings.split("\0") if count else []
+        return cls(strings=StringPool(values), **columns)
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        return {
+            "startpoint": self.startpoint,
+            "endpoint": self.endpoint,
+            "clock": self.clock,
+            "path_type": self.path_type,
+            "data_arrival_time": self.data_arrival_time,
+            "data_required_time": self.data_required_time,
+            "slack": self.slack,
+            "status": self.status,
+            "stage_offsets": self.stage_offsets,
+            "stage_delay": self.stage_delay,
+            "stage_cell": self.stage_cell,
+            "point_offsets": self.point_offsets,
+            "point_segment": self.point_segment,
+            "point_kind": self.point_kind,
+            "point_edge": self.point_edge,
+            "point_delay": self.point_delay,
+            "point_time": self.point_time,
+            "point_description": self.point_description,
+            "corner": self.corner,
+        }
+
+
+class TimingPathTableBuilder:
+    """Accumulates parsed path records into compact arrays, then builds a table"""
+
+    def __init__(self):
+        self.strings = StringPool()
+        self._startpoint = array("i")
+        self._endpoint = array("i")
+        self._clock = array("i")
+        self._path_type = array("i")
+        self._arrival = array("d")
+        self._required = array("d")
+        self._slack = array("d")
+        self._status = array("b")
+        self._offsets = array("q", [0])
+        self._stage_delay = array("d")
+        self._stage_cell = array("i")
+        self._point_offsets = array("q", [0])
+        self._point_segment = array("b")
+        self._point_kind = array("b")
+        self._point_edge = array("b")
+        self._point_delay = array("d")
+        self._point_time = array("d")
+        self._point_description = array("i")
+        self._corner = array("i")
+
+    def add(self, path: PathRecord):
+        intern = self.strings.intern
+        self._startpoint.append(intern(path.startpoint))
+        self._endpoint.append(intern(path.endpoint))
+        self._clock.append(intern(path.clock))
+        self._path_type.append(intern(path.path_type))
+        self._arrival.append(_nan(path.data_arrival_time))
+        self._required.append(_nan(path.data_required_time))
+        self._slack.append(_nan(path.slack))
+        self._status.append(STATUS_VIOLATED if path.status == "VIOLATED" else STATUS_MET)
+        for cell, delay in path.logic_chain:
+            self._stage_cell.append(intern(cell))
+            self._stage_delay.append(delay)
+        self._offsets.append(len(self._stage_delay))
+        for segment, kind, edge, delay, time, description in path.timing_points:
+            self._point_segment.append(segment)
+            self._point_kind.append(kind)
+            self._point_edge.append(edge)
+            self._point_delay.append(_nan(delay))
+            self._point_time.append(time)
+            self._point_description.append(intern(description))
+        self._point_offsets.append(len(self._point_time))
+        self._corner.append(intern(path.corner))
+
+    def build(self) -> TimingPathTable:
+        return TimingPathTable(
+            strings=self.strings,
+            startpoint=np.frombuffer(self._startpoint, dtype=np.int32),
+            endpoint=np.frombuffer(self._endpoint, dtype=np.int32),
+            clock=np.frombuffer(self._clock, dtype=np.int32),
+            path_type=np.frombuffer(self._path_type, dtype=np.int32),
+            data_arrival_time=np.frombuffer(self._arrival, dtype=np.float64),
+            data_required_time=np.frombuffer(self._required, dtype=np.float64),
+            slack=np.frombuffer(self._slack, dtype=np.float64),
+            status=np.frombuffer(self._status, dtype=np.int8),
+            stage_offsets=np.frombuffer(self._offsets, dtype=np.int64),
+            stage_delay=np.frombuffer(self._stage_delay, dtype=np.float64),
+            stage_cell=np.frombuffer(self._stage_cell, dtype=np.int32),
+            point_offsets=np.frombuffer(self._point_offsets, dtype=np.int64),
+            point_segment=np.frombuffer(self._point_segment, dtype=np.int8),
+            point_kind=np.frombuffer(self._point_kind, dtype=np.int8),
+            point_edge=np.frombuffer(self._point_edge, dtype=np.int8),
+            point_delay=np.frombuffer(self._point_delay, dtype=np.float64),
+            point_time=np.frombuffer(self._point_time, dtype=np.float64),
+            point_description=np.frombuffer(self._point_description, dtype=np.int32),
+            corner=np.frombuffer(self._corner, dtype=np.int32),
+        )
+
+
+def worst_rows(slack: np.ndarray, k: int, groups: Optional[Iterable] = None) -> np.ndarray:
+    """
+    Rows of the ``k`` lowest slacks (per group when ``groups`` labels each
+    row), worst first; rows without a slack are skipped.
+    """
+    rows = np.flatnonzero(~np.isnan(slack))
+    rows = rows[np.argsort(slack[rows], kind="stable")]
+    if groups is None:
+        return rows[:max(k, 0)]
+    groups = list(groups)
+    counts: Dict[object, int] = {}
+    kept = []
+    for row in rows.tolist():
+        count = counts.get(groups[row], 0)
+        if count < k:
+            counts[groups[row]] = count + 1
+            kept.append(row)
+    return np.asarray(kept, dtype=np.int64)
+
+
+def _take_ranges(offsets: np.ndarray, rows: np.ndarray):
+    """New CSR offsets and element indices for the given rows of a CSR column"""
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(counts, out=new_offsets[1:])
+    index = np.repeat(starts - new_offsets[:-1], counts) + np.arange(new_offsets[-1])
+    return new_offsets, index
+
+
+def _nan(value: Optional[float]) -> float:
+    return float("nan") if value is None else value
+
+
+def optional_float(value: float) -> Optional[float]:
+    """A column value as a float, or None where it is missing (NaN)"""
+    value = float(value)
+    return None if value != value else value
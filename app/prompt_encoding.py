@@ -0,0 +1,110 @@
+import json
+import os
+from collections import Counter
+from typing import List, Any, Optional
+
+from app.models import PathRecord, stage_cell_type
+
+# Default number of highest-delay stages kept when long chains are summarized
+DEFAULT_MAX_STAGES = 12
+
+# Path header fields and their abbreviations in the compact encoding
+_HEADER_FIELDS = (
+    ("startpoint", "sp"),
+    ("endpoint", "ep"),
+    ("clock", "clk"),
+    ("path_type", "type"),
+    ("status", "st"),
+    ("data_arrival_time", "arr"),
+    ("data_required_time", "req"),
+    ("slack", "slack"),
+    ("corner", "corner"),
+)
+
+# Library prefixes shorter than this are not worth factoring out
+_MIN_LIBRARY_PREFIX = 4
+
+
+def encode_path(path: PathRecord, compact: bool = True, max_stages: Optional[int] = None) -> str:
+    """A path as sent in the single-path prompt: compact, or the original indented JSON"""
+    if compact:
+        return encode_compact(path, max_stages)
+    return json.dumps(path.dict(), indent=2)
+
+
+def encode_compact(path: PathRecord, max_stages: Optional[int] = None) -> str:
+    """
+    Encode a path as a one-line header of abbreviated fields followed by a
+    table of its stages, with the shared library-cell prefix factored out.
+
+    With ``max_stages`` set, chains longer than that keep only their
+    ``max_stages`` highest-delay stages (in chain order, numbered by
+    position) plus an aggregate line for the omitted ones.
+    """
+    fields = path.dict()
+    header = [
+        f"{short}={_number(fields[name])}"
+        for name, short in _HEADER_FIELDS
+        if fields.get(name) not in (None, "")
+    ]
+
+    stages = [_split_stage(stage["cell"]) + (stage["delay"],) for stage in fields["logic_chain"]]
+    library = _library_prefix([cell for _, _, cell, _ in stages])
+    if library:
+        header.append(f"lib={library}")
+        stages = [
+            (edge, pin, cell[len(library):] if cell.startswith(library) else cell, delay)
+            for edge, pin, cell, delay in stages
+        ]
+
+    total = sum(delay for *_, delay in stages)
+    lines = ["|".join(header), f"stages n={len(stages)} delay={_number(round(total, 6))}", "# edge pin cell delay"]
+    kept = range(len(stages))
+    if max_stages and len(stages) > max_stages:
+        kept = sorted(sorted(kept, key=lambda k: -stages[k][3])[:max_stages])
+    for k in kept:
+        edge, pin, cell, delay = stages[k]
+        lines.append(f"{k + 1} {edge} {pin} {cell} {_number(delay)}")
+
+    omitted = sorted(set(range(len(stages))) - set(kept))
+    if omitted:
+        cells = Counter(stages[k][2] for k in omitted)
+        lines.append(
+            f"omitted n={len(omitted)} delay={_number(round(sum(stages[k][3] for k in omitted), 6))} "
+            f"cells={','.join(f'{cell}*{count}' for cell, count in cells.most_common())}"
+        )
+    return "\n".join(lines)
+
+
+def encode_batch_entry(index: int, path: PathRecord, compact: bool = True, max_stages: Optional[int] = None) -> str:
+    """One path of a batched prompt, tagged with its index within the batch"""
+    if compact:
+        return f"index={index}|{encode_compact(path, max_stages)}"
+    return json.dumps({"index": index, **path.dict()})
+
+
+def _split_stage(description: str):
+    """("^", "u1/Z", "BUF_X1") from a stage description such as "^ u1/Z (BUF_X1)"; "-" marks a missing part"""
+    cell = stage_cell_type(description)
+    words = (description[:description.rfind("(")] if cell else description).split()
+    edge = words.pop(0) if words and words[0] in ("^", "v") else "-"
+    # Multi-word descriptions (e.g. "input external delay") stay one readable column
+    return edge, "_".join(words) or "-", cell or "-"
+
+
+def _library_prefix(cells: List[str]) -> str:
+    """Prefix shared by the path's library cells, cut after its last "__" or "_" separator"""
+    # Ports print their direction ("in"/"out") where a library cell would be
+    library_cells = [cell for cell in cells if "_" in cell]
+    if len(library_cells) < 2:
+        return ""
+    prefix = os.path.commonprefix(library_cells)
+    cut = prefix.rfind("__")
+    cut = cut + 2 if cut >= 0 else prefix.rfind("_") + 1
+    return prefix[:cut] if cut >= _MIN_LIBRARY_PREFIX else ""
+
+
+def _number(value: Any) -> Any:
+    """Floats without trailing zeros; other values unchanged"""
+    return f"{value:g}" if isinstance(value, float) else value
+
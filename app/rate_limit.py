@@ -0,0 +1,140 @@
+import asyncio
+import random
+import re
+import time
+from typing import List, Any, Optional, Callable, Awaitable, TypeVar
+
+# Default per-key limits (Groq's published free-tier limits for llama-3.3-70b-versatile)
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 12000
+
+# Rate-limited requests are retried this many times before the error is raised
+MAX_RETRIES = 6
+
+# Exponential backoff (with full jitter) when a 429 carries no retry-after hint
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# "Please try again in 1m2.5s" / "in 750ms" in Groq rate-limit messages
+_TRY_AGAIN = re.compile(r"try again in (?:(\d+)m)?(\d+(?:\.\d+)?)(ms|s)\b", re.IGNORECASE)
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Continuously refilled budget of ``rate`` units per minute, holding at most one minute's worth"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / 60)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) * 60 / self.rate)
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class KeySlot:
+    """One pooled API key: its client, request and token buckets, and any server-imposed pause"""
+
+    def __init__(self, client: Any, requests_per_minute: float, tokens_per_minute: float):
+        self.client = client
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.blocked_until = 0.0
+
+    def delay(self, tokens: float) -> float:
+        return max(
+            self.blocked_until - time.monotonic(),
+            self.requests.delay(1),
+            self.tokens.delay(tokens),
+        )
+
+
+class RequestScheduler:
+    """
+    Spreads LLM requests over a pool of API keys within each key's rate limits.
+
+    Every request is sent on the key that can take it soonest (waiting if
+    none can). A 429 pauses that key for the server's retry-after hint, or
+    an exponential backoff with jitter, and the request is retried on the
+    next available key.
+    """
+
+    def __init__(
+        self,
+        clients: List[Any],
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        max_retries: int = MAX_RETRIES,
+    ):
+        if not clients:
+            raise ValueError("RequestScheduler needs at least one client")
+        self.slots = [KeySlot(client, requests_per_minute, tokens_per_minute) for client in clients]
+        self.max_retries = max_retries
+
+    async def run(self, call: Callable[[Any], Awaitable[T]], tokens: float = 0) -> T:
+        """Await ``call(client)`` on the soonest key with budget for one request of ``tokens`` tokens"""
+        for attempt in range(self.max_retries + 1):
+            slot = await self._acquire(tokens)
+            try:
+                return await call(slot.client)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                pause = retry_after(e)
+                if pause is None:
+                    pause = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+                slot.blocked_until = max(slot.blocked_until, time.monotonic() + pause)
+                print(f"Rate limited; retrying in {pause:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+
+    async def _acquire(self, tokens: float) -> KeySlot:
+        while True:
+            # Soonest available key first; among free keys, the one with the most budget left
+            slot = min(self.slots, key=lambda s: (s.delay(tokens), -s.requests.tokens))
+            wait = slot.delay(tokens)
+            if wait <= 0:
+                # No await between the check and the charge, so concurrent
+                # tasks cannot both spend the same budget
+                slot.requests.consume(1)
+                slot.tokens.consume(tokens)
+                return slot
+            await asyncio.sleep(wait)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "rate_limit" in message
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds to wait from a retry-after header or a "try again in ..." message, if present"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+    match = _TRY_AGAIN.search(str(error))
+    if match:
+        minutes, amount, unit = match.groups()
+        seconds = float(amount) / 1000 if unit.lower() == "ms" else float(amount)
+        return seconds + 60 * int(minutes or 0)
+    return None
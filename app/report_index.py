@@ -0,0 +1,185 @@
+import mmap
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Iterator, Union, Tuple, IO
+
+import numpy as np
+
+from app.models import PathRecord
+from app.path_table import STATUS_MET, STATUS_VIOLATED, TimingPathTable, TimingPathTableBuilder, worst_rows
+from app.utils import WORST_K_GROUPS, PageReleaser, STAParser, detect_compression, map_report
+
+_MARKER = b"Startpoint:"
+_SLACK_RE = re.compile(rb"[ \t]*(-?\d+(?:\.\d*)?)[ \t]+[Ss]lack\b([^\r\n]*)")
+
+# Parsed paths kept per index; older ones are re-parsed from the map on access
+PARSED_CACHE_SIZE = 4096
+
+
+class ReportIndex:
+    """
+    Random-access collection of the paths in a report, parsed on demand.
+
+    Building the index is a single regex scan that records the byte range of
+    every Startpoint block and peeks at its slack line, so ``slack`` and
+    ``status`` are available for every path immediately. A block is only run
+    through STAParser when that path is accessed; the most recently parsed
+    ``PARSED_CACHE_SIZE`` paths are kept.
+    """
+
+    def __init__(
+        self,
+        data: Union[bytes, mmap.mmap],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        slack: np.ndarray,
+        status: np.ndarray,
+        parser: Optional[STAParser] = None,
+    ):
+        self.data = data
+        self.starts = starts
+        self.ends = ends
+        self.slack = slack
+        self.status = status
+        self.parser = parser or STAParser()
+        self._parsed: "OrderedDict[int, Optional[PathRecord]]" = OrderedDict()
+
+    @classmethod
+    def build(cls, source: Union[bytes, mmap.mmap, str, Path, IO], parser: Optional[STAParser] = None) -> "ReportIndex":
+        """Index report bytes, a mapped report, or a file path or object (memory-mapped via map_report)"""
+        if isinstance(source, mmap.mmap):
+            data = source
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            data = map_report(source)
+        if detect_compression(data[:6]):
+            raise ValueError("Compressed reports cannot be indexed; stream them with STAParser.iter_paths(open_report(...))")
+
+        pages = PageReleaser(data)
+        parser = parser or STAParser()
+        filter_headers = parser.path_type is not None or parser.path_group is not None
+
+        starts = []
+        slack_values = []
+        violated = []
+        rejected = []
+        pos = data.find(_MARKER)
+        while pos != -1:
+            start = pos + len(_MARKER)
+            pos = data.find(_MARKER, start)
+            starts.append(start)
+            value, is_violated = _peek_slack(data, start, len(data) if pos == -1 else pos)
+            slack_values.append(value)
+            violated.append(is_violated)
+            if filter_headers:
+                rejected.append(not parser.accepts_header(
+                    STAParser.header_lines(data, start, len(data) if pos == -1 else pos)
+                ))
+            pages.advance(start)
+        pages.finish()
+
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.empty_like(starts)
+        ends[:-1] = starts[1:] - len(_MARKER)
+        if len(ends):
+            ends[-1] = len(data)
+        slack = np.asarray(slack_values, dtype=np.float64)
+        status = np.where(np.asarray(violated, dtype=bool), STATUS_VIOLATED, STATUS_MET).astype(np.int8)
+
+        index = cls(data, starts, ends, slack, status, parser)
+
+        # Every predicate is resolved from the peeked slack and header lines,
+        # so the index only holds blocks that parse to a path
+        keep = np.ones(len(index), dtype=bool)
+        if filter_headers:
+            keep &= ~np.asarray(rejected, dtype=bool)
+        if parser.status is not None:
+            keep &= status == (STATUS_VIOLATED if parser.status == "VIOLATED" else STATUS_MET)
+        if parser.slack_below is not None:
+            keep &= slack < parser.slack_below
+        return index if keep.all() else index.select(keep)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> PathRecord:
+        return self.path(i)
+
+    def __iter__(self) -> Iterator[PathRecord]:
+        for i in range(len(self)):
+            path = self.path(i)
+            if path:
+                yield path
+
+    def path(self, i: int) -> Optional[PathRecord]:
+        """Parse (once) and return the path at position ``i``"""
+        if i < 0:
+            i += len(self)
+        if i in self._parsed:
+            self._parsed.move_to_end(i)
+            return self._parsed[i]
+        path = self._parsed[i] = self.parser.parse_lines(self._lines(i))
+        if len(self._parsed) > PARSED_CACHE_SIZE:
+            self._parsed.popitem(last=False)
+        return path
+
+    def to_paths(self) -> List[PathRecord]:
+        return list(self)
+
+    def to_table(self) -> TimingPathTable:
+        """Parse the indexed blocks straight into a TimingPathTable, without caching the paths"""
+        builder = TimingPathTableBuilder()
+        pages = PageReleaser(self.data)
+        for i in range(len(self)):
+            path = self.parser.parse_lines(self._lines(i))
+            if path:
+                builder.add(path)
+            pages.advance(int(self.starts[i]))
+        return builder.build()
+
+    def violated_mask(self) -> np.ndarray:
+        return self.status == STATUS_VIOLATED
+
+    def worst(self, k: int, group_by: Optional[str] = None) -> "ReportIndex":
+        """
+        Keep the ``k`` paths with the lowest peeked slack (per group with
+        ``group_by``, as in STAParser.worst_paths), worst first. Only the
+        header lines of each block are read to group them.
+        """
+        if group_by not in WORST_K_GROUPS:
+            raise ValueError(f"group_by must be one of {WORST_K_GROUPS}")
+        kind = WORST_K_GROUPS[group_by]
+        groups = None
+        if kind:
+            groups = [
+                self.parser.peek_header(STAParser.header_lines(self.data, start, end), kind)
+                for start, end in zip(self.starts.tolist(), self.ends.tolist())
+            ]
+        return self.select(worst_rows(self.slack, k, groups))
+
+    def select(self, rows: Union[np.ndarray, List[int]]) -> "ReportIndex":
+        """Return an index over the given rows (boolean mask or indices)"""
+        rows = np.asarray(rows)
+        rows = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64, copy=False)
+        return ReportIndex(
+            self.data, self.starts[rows], self.ends[rows], self.slack[rows], self.status[rows], self.parser
+        )
+
+    def _lines(self, i: int) -> List[bytes]:
+        return self.data[self.starts[i]:self.ends[i]].split(b"\n")
+
+
+def _peek_slack(data: Union[bytes, mmap.mmap], start: int, end: int) -> Tuple[float, bool]:
+    """Read the slack line of one block without tokenizing the rest of it"""
+    pos = data.rfind(b"slack", start, end)
+    if pos == -1:
+        pos = data.rfind(b"Slack", start, end)
+    if pos == -1:
+        return float("nan"), False
+    line_start = data.rfind(b"\n", start, pos) + 1 or start
+    m = _SLACK_RE.match(data, line_start, end)
+    if m is None:
+        return float("nan"), False
+    return float(m.group(1)), b"VIOLATED" in m.group(2).upper()
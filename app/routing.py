@@ -0,0 +1,45 @@
+from typing import Dict, Any, Tuple
+
+from app.models import PathRecord
+
+# Model tiers: a small, fast model for routine paths and the large model
+TIER_FAST = "fast"
+TIER_LARGE = "large"
+
+LARGE_MODEL_NAME = "llama-3.3-70b-versatile"
+FAST_MODEL_NAME = "llama-3.1-8b-instant"
+
+TIER_MODELS = {TIER_FAST: FAST_MODEL_NAME, TIER_LARGE: LARGE_MODEL_NAME}
+
+# Violations with slack below this (ns) are critical and go to the large model
+DEFAULT_CRITICAL_SLACK = -0.2
+
+# Logic chains with more stages than this are deep and go to the large model
+DEFAULT_DEEP_STAGES = 10
+
+
+class RoutingPolicy:
+    """
+    Picks the model tier for each path.
+
+    Critical violations (slack below ``critical_slack``) and deep chains
+    (more than ``deep_stages`` stages) go to the large model; shallow,
+    marginal violations and met paths go to the fast one.
+    """
+
+    def __init__(self, critical_slack: float = DEFAULT_CRITICAL_SLACK, deep_stages: int = DEFAULT_DEEP_STAGES):
+        self.critical_slack = critical_slack
+        self.deep_stages = deep_stages
+
+    def route(self, path: PathRecord) -> Tuple[str, str]:
+        """The path's tier and the reason for it"""
+        if path.status == "VIOLATED" and path.slack is not None and path.slack < self.critical_slack:
+            return TIER_LARGE, f"critical: slack {path.slack} < {self.critical_slack} ns"
+        if len(path.logic_chain) > self.deep_stages:
+            return TIER_LARGE, f"deep: {len(path.logic_chain)} > {self.deep_stages} stages"
+        if path.status == "VIOLATED":
+            return TIER_FAST, f"marginal: slack {path.slack} >= {self.critical_slack} ns"
+        return TIER_FAST, "timing met"
+
+    def thresholds(self) -> Dict[str, Any]:
+        return {"critical_slack": self.critical_slack, "deep_stages": self.deep_stages}
@@ -0,0 +1,237 @@
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+from app.models import SEGMENT_LAUNCH, SEGMENT_CAPTURE, POINT_CLOCK_EDGE, stage_cell_type
+from app.path_table import TimingPathTable
+
+# Hold violations whose data path delay is below this (ns) are treated as
+# direct connections that need delay inserted
+HOLD_MAX_DATA_DELAY = 0.05
+
+# Paths whose I/O external delay takes at least this share of the clock period
+EXTERNAL_DELAY_SHARE = 0.5
+
+# Setup paths at least this deep, with this share of stages on one cell type
+DEEP_CHAIN_STAGES = 8
+DEEP_CHAIN_SHARE = 0.75
+
+# Violation severity by slack (ns): the first threshold the slack is below
+SEVERITY_LEVELS = ((-0.5, "critical"), (-0.2, "high"), (-0.05, "medium"))
+
+# Rule ids, in the order they are tried
+RULE_MET = 0
+RULE_HOLD_DIRECT = 1
+RULE_OUTPUT_DELAY = 2
+RULE_INPUT_DELAY = 3
+RULE_DEEP_CHAIN = 4
+
+
+def pre_analyze(table: TimingPathTable) -> Tuple[Dict[int, Dict[str, Any]], np.ndarray]:
+    """
+    Diagnose the paths the rules can classify confidently, without the LLM.
+
+    Every rule is evaluated over whole columns at once. Returns results (in
+    TimingAnalyzer's schema) keyed by row, and the rows left for the LLM.
+    """
+    count = len(table)
+    features = _features(table)
+    violated = table.violated_mask()
+    setup = table.path_type_mask("max")
+    hold = table.path_type_mask("min")
+    period = features["period"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        output_share = np.abs(features["output_external_delay"]) / period
+        input_share = features["input_external_delay"] / period
+        chain_share = features["dominant_count"] / features["stages"]
+
+    rules = (
+        (RULE_MET, ~violated),
+        (RULE_HOLD_DIRECT, violated & hold & (features["data_delay"] < HOLD_MAX_DATA_DELAY)),
+        (RULE_OUTPUT_DELAY, violated & setup & (period > 0) & (output_share >= EXTERNAL_DELAY_SHARE)),
+        (RULE_INPUT_DELAY, violated & setup & (period > 0) & (input_share >= EXTERNAL_DELAY_SHARE)),
+        (RULE_DEEP_CHAIN, violated & setup & (features["stages"] >= DEEP_CHAIN_STAGES) & (chain_share >= DEEP_CHAIN_SHARE)),
+    )
+    rule = np.full(count, -1, dtype=np.int64)
+    for rule_id, matches in rules:
+        rule[(rule == -1) & matches] = rule_id
+
+    strings = table.strings
+    results = {}
+    for i in np.flatnonzero(rule >= 0).tolist():
+        slack = None if np.isnan(table.slack[i]) else float(table.slack[i])
+        diagnosis = _DIAGNOSES[int(rule[i])](
+            slack=slack,
+            data_delay=float(features["data_delay"][i]),
+            period=float(period[i]),
+            output_delay=abs(float(features["output_external_delay"][i])),
+            input_delay=float(features["input_external_delay"][i]),
+            stages=int(features["stages"][i]),
+            dominant=features["dominant_names"][i],
+            dominant_count=int(features["dominant_count"][i]),
+        )
+        diagnosis.update({
+            "startpoint": strings[table.startpoint[i]],
+            "endpoint": strings[table.endpoint[i]],
+            "path_type": strings[table.path_type[i]],
+            "status": "VIOLATED" if violated[i] else "MET",
+            "slack": slack,
+            "corner": strings[table.corner[i]],
+            "source": "rules",
+        })
+        results[i] = diagnosis
+    return results, np.flatnonzero(rule == -1)
+
+
+def _features(table: TimingPathTable) -> Dict[str, Any]:
+    """Per-path quantities the rules test, computed column-wise"""
+    count = len(table)
+    stages = table.stage_counts()
+    stage_rows = np.repeat(np.arange(count), stages)
+    data_delay = np.bincount(stage_rows, weights=table.stage_delay, minlength=count)
+
+    # Most frequent library cell per path: count (row, cell type) pairs
+    strings = table.strings
+    unique_cells, cell_index = np.unique(table.stage_cell, return_inverse=True)
+    type_ids: Dict[str, int] = {}
+    cell_types = np.array(
+        [type_ids.setdefault(stage_cell_type(strings[cell]), len(type_ids)) for cell in unique_cells.tolist()],
+        dtype=np.int64,
+    )
+    type_names = list(type_ids)
+    stage_types = cell_types[cell_index] if len(cell_index) else np.empty(0, dtype=np.int64)
+
+    dominant_count = np.zeros(count, dtype=np.int64)
+    dominant_type = np.full(count, -1, dtype=np.int64)
+    if len(stage_types):
+        pairs, pair_counts = np.unique(stage_rows * len(type_names) + stage_types, return_counts=True)
+        pair_rows = pairs // len(type_names)
+        # Within each row, the last pair after sorting by count is the most frequent type
+        order = np.lexsort((pair_counts, pair_rows))
+        last = np.append(pair_rows[order][1:] != pair_rows[order][:-1], True)
+        best = order[last]
+        dominant_count[pair_rows[best]] = pair_counts[best]
+        dominant_type[pair_rows[best]] = pairs[best] % len(type_names)
+
+    # Clock period: capture clock edge time minus launch clock edge time
+    point_rows = np.repeat(np.arange(count), np.diff(table.point_offsets))
+    period = np.zeros(count)
+    for segment, sign in ((SEGMENT_CAPTURE, 1), (SEGMENT_LAUNCH, -1)):
+        edge = (table.point_segment == segment) & (table.point_kind == POINT_CLOCK_EDGE)
+        period[point_rows[edge]] += sign * table.point_time[edge]
+
+    summary = table.clock_summary()
+    return {
+        "stages": stages,
+        "data_delay": data_delay,
+        "dominant_count": dominant_count,
+        "dominant_names": [type_names[t] if t >= 0 else "" for t in dominant_type.tolist()],
+        "period": period,
+        "output_external_delay": summary["output_external_delay"],
+        "input_external_delay": summary["input_external_delay"],
+    }
+
+
+def _severity(slack) -> str:
+    for threshold, level in SEVERITY_LEVELS:
+        if slack is not None and slack < threshold:
+            return level
+    return "low"
+
+
+def _suggestion(fix: str, priority: str, explanation: str) -> Dict[str, str]:
+    return {"fix": fix, "priority": priority, "explanation": explanation}
+
+
+def _met(slack, **_) -> Dict[str, Any]:
+    return {
+        "root_cause": f"Timing is met with {slack} ns of slack; no action required.",
+        "severity": "low",
+        "suggestions": [],
+        "estimated_effort": "low",
+    }
+
+
+def _hold_direct(slack, data_delay, **_) -> Dict[str, Any]:
+    return {
+        "root_cause": (
+            f"Hold violation on a near-direct connection: the data path adds only {data_delay:.3f} ns, "
+            f"so new data reaches the endpoint before the hold requirement is satisfied (slack {slack} ns)."
+        ),
+        "severity": _severity(slack),
+        "suggestions": [
+            _suggestion("Insert hold buffers", "high",
+                        "Add delay cells on the data path close to the endpoint to cover the hold requirement"),
+            _suggestion("Check the input delay constraint", "medium",
+                        "For input ports, confirm set_input_delay -min reflects the real external minimum delay"),
+            _suggestion("Reduce capture clock skew", "low",
+                        "Late capture clock arrival tightens hold; balance the clock tree toward the endpoint"),
+        ],
+        "estimated_effort": "low",
+    }
+
+
+def _output_delay(slack, period, output_delay, **_) -> Dict[str, Any]:
+    return {
+        "root_cause": (
+            f"Output external delay of {output_delay:.3f} ns takes {output_delay / period:.0%} of the "
+            f"{period:.3f} ns clock period, leaving too little time for the internal path (slack {slack} ns)."
+        ),
+        "severity": _severity(slack),
+        "suggestions": [
+            _suggestion("Review the output delay budget", "high",
+                        "Confirm set_output_delay matches the external device's real setup requirement"),
+            _suggestion("Register the output", "high",
+                        "Drive the port directly from a flip-flop so the internal path delay is minimal"),
+            _suggestion("Upsize the output driver", "medium",
+                        "A stronger output buffer reduces the port transition and the final stage delay"),
+        ],
+        "estimated_effort": "medium",
+    }
+
+
+def _input_delay(slack, period, input_delay, **_) -> Dict[str, Any]:
+    return {
+        "root_cause": (
+            f"Input external delay of {input_delay:.3f} ns takes {input_delay / period:.0%} of the "
+            f"{period:.3f} ns clock period, leaving too little time for the internal path (slack {slack} ns)."
+        ),
+        "severity": _severity(slack),
+        "suggestions": [
+            _suggestion("Review the input delay budget", "high",
+                        "Confirm set_input_delay matches the external device's real clock-to-output delay"),
+            _suggestion("Register the input", "high",
+                        "Capture the port in a flip-flop before any logic so the internal path is minimal"),
+            _suggestion("Move logic after the input register", "medium",
+                        "Shift combinational logic on the input path into the next pipeline stage"),
+        ],
+        "estimated_effort": "medium",
+    }
+
+
+def _deep_chain(slack, stages, dominant, dominant_count, **_) -> Dict[str, Any]:
+    return {
+        "root_cause": (
+            f"Deep logic chain of {stages} stages, {dominant_count} of them {dominant} cells in series "
+            f"(e.g. a ripple carry chain), exceeds the clock period (slack {slack} ns)."
+        ),
+        "severity": _severity(slack),
+        "suggestions": [
+            _suggestion("Restructure the chain", "high",
+                        f"Replace the serial {dominant} chain with a parallel structure, e.g. a prefix adder"),
+            _suggestion("Insert a pipeline register", "high",
+                        "Split the chain across two clock cycles"),
+            _suggestion(f"Use faster {dominant} variants", "medium",
+                        "Swap to higher drive strength or lower threshold voltage cells along the chain"),
+        ],
+        "estimated_effort": "high",
+    }
+
+
+_DIAGNOSES = {
+    RULE_MET: _met,
+    RULE_HOLD_DIRECT: _hold_direct,
+    RULE_OUTPUT_DELAY: _output_delay,
+    RULE_INPUT_DELAY: _input_delay,
+    RULE_DEEP_CHAIN: _deep_chain,
+}
@@ -0,0 +1,85 @@
+import json
+from typing import List, Dict, Any, Tuple, Literal
+
+from pydantic import TypeAdapter, ValidationError, field_validator
+
+from app.models import AnalysisSuggestion, ViolationAnalysis
+
+# Fields the LLM answers; the path fields are filled in from the parsed path
+ANALYSIS_FIELDS = ("root_cause", "severity", "suggestions", "estimated_effort")
+
+# How each field is described to the model in a repair request
+FIELD_DESCRIPTIONS = {
+    "root_cause": "string (detailed technical explanation)",
+    "severity": '"critical", "high", "medium", "low"',
+    "suggestions": 'list of objects with "fix", "priority", "explanation"',
+    "estimated_effort": '"low", "medium", "high"',
+}
+
+
+class _Suggestion(AnalysisSuggestion):
+    priority: Literal["high", "medium", "low"]
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _lower(cls, value):
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class _Response(ViolationAnalysis):
+    """ViolationAnalysis with every answered field required and enums enforced"""
+    root_cause: str
+    severity: Literal["critical", "high", "medium", "low"]
+    suggestions: List[_Suggestion]
+    estimated_effort: Literal["low", "medium", "high"]
+
+    @field_validator("severity", "estimated_effort", mode="before")
+    @classmethod
+    def _lower(cls, value):
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+# Built once: pydantic compiles the schema into a core validator here
+_RESPONSE_VALIDATOR = TypeAdapter(_Response)
+
+
+def validate_analysis(result: Any) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Validate an analysis (path fields included) against ViolationAnalysis.
+
+    Returns the normalized answered fields when valid, else the problems
+    found as ``{field: message}``, restricted to the answered fields.
+    """
+    if not isinstance(result, dict):
+        return {}, {field: "Field required" for field in ANALYSIS_FIELDS}
+    try:
+        analysis = _RESPONSE_VALIDATOR.validate_python(result)
+    except ValidationError as e:
+        problems = {}
+        for error in e.errors():
+            field = error["loc"][0] if error["loc"] else None
+            if field in ANALYSIS_FIELDS:
+                problems.setdefault(field, error["msg"])
+        if problems:
+            return {}, problems
+        raise
+    return analysis.model_dump(include=set(ANALYSIS_FIELDS)), {}
+
+
+def repair_inputs(result: Dict[str, Any], problems: Dict[str, str]) -> Dict[str, str]:
+    """Prompt inputs of a repair request: the valid part of the answer and the fields to redo"""
+    answer = {field: result[field] for field in ANALYSIS_FIELDS if field in result and field not in problems}
+    return {
+        "answer": json.dumps(answer) if answer else "(none)",
+        "problems": "\n".join(
+            f'- "{field}": {FIELD_DESCRIPTIONS[field]} (problem: {message})' for field, message in problems.items()
+        ),
+    }
+
+
+def merge_repair(result: Dict[str, Any], response: Any, problems: Dict[str, str]) -> Dict[str, Any]:
+    """The answer with the repaired fields of a repair response filled in"""
+    merged = dict(result)
+    if isinstance(response, dict):
+        merged.update({field: response[field] for field in problems if field in response})
+    return merged
@@ -0,0 +1,57 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class TokenUsage:
+    """
+    Prompt and completion tokens of every LLM call an analyzer makes.
+
+    Counts come from the provider's usage report on the response; calls
+    whose response carries none are recorded with the prompt estimate and
+    flagged ``reported=False``.
+    """
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def record(self, kind: str, model: str, paths: int, encoding: str, estimated_prompt_tokens: int, message: Any):
+        """Record one completed call ("path", "batch" or "repair") to ``model`` from its response message"""
+        usage = message_usage(message)
+        prompt_tokens, completion_tokens = usage if usage is not None else (estimated_prompt_tokens, 0)
+        self.calls.append({
+            "kind": kind,
+            "model": model,
+            "paths": paths,
+            "encoding": encoding,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_prompt_tokens": estimated_prompt_tokens,
+            "reported": usage is not None,
+        })
+
+    def totals(self) -> Dict[str, Any]:
+        # Repair calls redo fields of paths already counted
+        paths = sum(call["paths"] for call in self.calls if call["kind"] != "repair")
+        prompt_tokens = sum(call["prompt_tokens"] for call in self.calls)
+        completion_tokens = sum(call["completion_tokens"] for call in self.calls)
+        return {
+            "calls": len(self.calls),
+            "repair_calls": sum(call["kind"] == "repair" for call in self.calls),
+            "paths": paths,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_per_path": prompt_tokens / paths if paths else 0.0,
+            "completion_tokens_per_path": completion_tokens / paths if paths else 0.0,
+        }
+
+
+def message_usage(message: Any) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens reported on a chat model response, if any"""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    # Older integrations only report usage in the provider's response metadata
+    usage = (getattr(message, "response_metadata", None) or {}).get("token_usage")
+    if usage:
+        return int(usage.get("prompt_tokens", 0)), int(usage.get("completion_tokens", 0))
+    return None
@@ -1,16 +1,41 @@
+import os
+import time
+import asyncio
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import tempfile
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from app.utils import STAParser, generate_pdf_bytes
-from app.inference import TimingAnalyzer
-from app.models import TimingPath
+from io import BytesIO
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+from app.utils import STAParser, generate_pdf_bytes, open_report, map_report
+from app.parse_cache import report_digest, load_table, store_table
+from app.report_index import ReportIndex
+from app.corners import CornerMerge, corner_name, parse_corners
+from app.endpoint_collapse import EndpointCollapse, collapse_endpoints
+from app.clustering import DEFAULT_SLACK_BUCKET, cluster_paths
+from app.rules import pre_analyze
+from app.path_table import TimingPathTable
+from app.inference import TimingAnalyzer, DEFAULT_CONCURRENCY, DEFAULT_BATCH_TOKENS
+from app.prompt_encoding import DEFAULT_MAX_STAGES
+from app.token_usage import TokenUsage
+from app.routing import RoutingPolicy, DEFAULT_CRITICAL_SLACK, DEFAULT_DEEP_STAGES, FAST_MODEL_NAME, LARGE_MODEL_NAME
+from app.rate_limit import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE
+from app.models import PathRecord
 from auth.session import get_current_user
-from core.api_manager import get_api_key_by_id, get_api_keys_for_dropdown
+from core.api_manager import get_api_key_by_id, get_api_keys_for_dropdown, get_all_api_keys
 from core.logger import log_action
 
+# Reports larger than this are indexed first, and only the blocks chosen for
+# analysis are parsed
+LAZY_INDEX_BYTES = 256 * 1024 * 1024
+
+# Server directories users may open reports from by path (os.pathsep-separated).
+# Leave STA_REPORT_DIRS unset to allow uploads only.
+SERVER_REPORT_DIRS = [Path(d).resolve() for d in os.environ.get("STA_REPORT_DIRS", "").split(os.pathsep) if d]
+
 
 def setup_sidebar() -> Dict[str, Any]:
     """Setup sidebar configuration"""
@@ -25,7 +50,28 @@ def setup_sidebar() -> Dict[str, Any]:
             "api_key": None,
             "api_key_id": None,
             "timing_file": None,
+            "server_path": None,
+            "corner_files": [],
             "analyze_violations_only": True,
+            "worst_k": None,
+            "worst_k_group": None,
+            "per_endpoint": 1,
+            "slack_bucket": DEFAULT_SLACK_BUCKET,
+            "pre_analyze": True,
+            "concurrency": DEFAULT_CONCURRENCY,
+            "batch_tokens": None,
+            "compact_prompts": True,
+            "max_stages": None,
+            "json_mode": True,
+            "stream": True,
+            "routing": None,
+            "bypass_cache": False,
+            "pool_keys": [],
+            "requests_per_minute": DEFAULT_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": DEFAULT_TOKENS_PER_MINUTE,
+            "path_type": None,
+            "path_group": None,
+            "slack_below": None,
             "show_raw_data": False
         }
     
@@ -51,8 +97,24 @@ def setup_sidebar() -> Dict[str, Any]:
     st.sidebar.header("📁 Upload Files")
     timing_file = st.sidebar.file_uploader(
         "STA Timing Report",
-        type=['txt', 'rpt', 'log'],
-        help="Upload your Static Timing Analysis report"
+        type=['txt', 'rpt', 'log', 'gz', 'bz2', 'xz'],
+        help="Upload your Static Timing Analysis report (optionally gzip, bzip2 or xz compressed)"
+    )
+
+    server_path = None
+    if SERVER_REPORT_DIRS:
+        server_path = _validate_server_path(st.sidebar.text_input(
+            "...or report path on the server",
+            help="Reports on the server's filesystem are memory-mapped instead of uploaded. "
+                 f"Allowed directories: {', '.join(str(d) for d in SERVER_REPORT_DIRS)}"
+        ).strip())
+
+    corner_files = st.sidebar.file_uploader(
+        "...or one report per corner",
+        type=['txt', 'rpt', 'log', 'gz', 'bz2', 'xz'],
+        accept_multiple_files=True,
+        help="Paths are matched across corners by startpoint, endpoint and path type, "
+             "and each is analyzed once, at its worst corner. Corners are named after the files."
     )
 
     st.sidebar.header("🔧 Analysis Options")
@@ -62,6 +124,164 @@ def setup_sidebar() -> Dict[str, Any]:
         help="Only analyze paths with timing violations"
     )
 
+    analyze_worst_k = st.sidebar.checkbox(
+        "Analyze worst K paths only",
+        value=False,
+        help="Keep only the K paths with the most negative slack while parsing"
+    )
+    worst_k = st.sidebar.number_input(
+        "K",
+        min_value=1,
+        value=200,
+        step=50,
+        disabled=not analyze_worst_k
+    )
+    worst_k_group = st.sidebar.selectbox(
+        "Worst K per",
+        ["report", "path group", "path type"],
+        disabled=not analyze_worst_k
+    )
+
+    collapse = st.sidebar.checkbox(
+        "Collapse paths per endpoint",
+        value=True,
+        help="Analyze only the worst path(s) into each endpoint; the rest are summarized"
+    )
+    per_endpoint = st.sidebar.number_input(
+        "Paths kept per endpoint",
+        min_value=1,
+        value=1,
+        disabled=not collapse
+    )
+
+    cluster = st.sidebar.checkbox(
+        "Cluster structurally similar paths",
+        value=True,
+        help="Paths with the same cell sequence, path type and slack bucket share one analysis"
+    )
+    slack_bucket = st.sidebar.number_input(
+        "Cluster slack bucket (ns)",
+        min_value=0.001,
+        value=DEFAULT_SLACK_BUCKET,
+        step=0.05,
+        format="%.3f",
+        disabled=not cluster
+    )
+    use_rules = st.sidebar.checkbox(
+        "Resolve common violations locally",
+        value=True,
+        help="Diagnose met paths, direct hold violations, I/O-constraint-dominated and deep-chain paths with built-in rules instead of the LLM"
+    )
+    concurrency = st.sidebar.number_input(
+        "Concurrent LLM requests",
+        min_value=1,
+        max_value=64,
+        value=DEFAULT_CONCURRENCY,
+        help="Number of paths analyzed in parallel"
+    )
+    batch_paths = st.sidebar.checkbox(
+        "Batch several paths per request",
+        value=False,
+        help="Pack paths into shared prompts up to a token budget, so the instructions are sent once per batch"
+    )
+    batch_tokens = st.sidebar.number_input(
+        "Prompt token budget",
+        min_value=1000,
+        value=DEFAULT_BATCH_TOKENS,
+        step=1000,
+        disabled=not batch_paths
+    )
+    compact_prompts = st.sidebar.checkbox(
+        "Compact prompt encoding",
+        value=True,
+        help="Send paths as an abbreviated header and stage table instead of indented JSON"
+    )
+    summarize_chains = st.sidebar.checkbox(
+        "Summarize long logic chains",
+        value=False,
+        disabled=not compact_prompts,
+        help="Send only the highest-delay stages of long chains, plus totals for the rest"
+    )
+    max_stages = st.sidebar.number_input(
+        "Stages kept per chain",
+        min_value=1,
+        value=DEFAULT_MAX_STAGES,
+        disabled=not (compact_prompts and summarize_chains)
+    )
+    json_mode = st.sidebar.checkbox(
+        "Constrain responses to JSON",
+        value=True,
+        help="Use the provider's JSON mode; invalid or missing fields are repaired with short follow-up requests"
+    )
+    stream = st.sidebar.checkbox(
+        "Stream answers as they are generated",
+        value=True,
+        help="Show each root cause and suggestion as soon as the model has written it"
+    )
+    bypass_cache = st.sidebar.checkbox(
+        "Bypass analysis cache",
+        value=False,
+        help="Re-run the LLM for every path instead of reusing cached analyses of identical paths"
+    )
+
+    with st.sidebar.expander("Rate Limits"):
+        pool_keys = st.checkbox(
+            "Spread requests across all API keys",
+            value=False,
+            disabled=len(api_keys) < 2,
+            help="Schedule requests over every stored key, each within its own rate limits"
+        )
+        requests_per_minute = st.number_input(
+            "Requests per minute per key",
+            min_value=1,
+            value=DEFAULT_REQUESTS_PER_MINUTE
+        )
+        tokens_per_minute = st.number_input(
+            "Tokens per minute per key",
+            min_value=1000,
+            value=DEFAULT_TOKENS_PER_MINUTE,
+            step=1000
+        )
+
+    with st.sidebar.expander("Model Routing"):
+        route_models = st.checkbox(
+            "Route routine paths to a fast model",
+            value=True,
+            help=f"Shallow, marginal violations and met paths go to {FAST_MODEL_NAME}; critical or deep ones "
+                 f"to {LARGE_MODEL_NAME}. Fast-model answers that fail validation are redone by the large model."
+        )
+        critical_slack = st.number_input(
+            "Critical slack below (ns)",
+            value=DEFAULT_CRITICAL_SLACK,
+            step=0.05,
+            format="%.3f",
+            disabled=not route_models
+        )
+        deep_stages = st.number_input(
+            "Deep chain above (stages)",
+            min_value=1,
+            value=DEFAULT_DEEP_STAGES,
+            disabled=not route_models
+        )
+
+    with st.sidebar.expander("Path Filters"):
+        path_type = st.selectbox(
+            "Path type",
+            ["any", "max", "min"],
+            help="Only parse setup (max) or hold (min) paths"
+        )
+        path_group = st.text_input(
+            "Path group",
+            help="Only parse paths in this path group (leave empty for all)"
+        ).strip()
+        limit_slack = st.checkbox("Only paths with slack below a threshold")
+        slack_below = st.number_input(
+            "Slack threshold (ns)",
+            value=0.0,
+            step=0.01,
+            disabled=not limit_slack
+        )
+
     show_raw_data = st.sidebar.checkbox(
         "Show raw parsed data",
         value=False
@@ -71,11 +291,46 @@ def setup_sidebar() -> Dict[str, Any]:
         "api_key": api_key,
         "api_key_id": selected_key_id,
         "timing_file": timing_file,
+        "server_path": server_path,
+        "corner_files": corner_files or [],
         "analyze_violations_only": analyze_violations_only,
+        "worst_k": int(worst_k) if analyze_worst_k else None,
+        "worst_k_group": {"path group": "path_group", "path type": "path_type"}.get(worst_k_group),
+        "per_endpoint": int(per_endpoint) if collapse else None,
+        "slack_bucket": float(slack_bucket) if cluster else None,
+        "pre_analyze": use_rules,
+        "concurrency": int(concurrency),
+        "batch_tokens": int(batch_tokens) if batch_paths else None,
+        "compact_prompts": compact_prompts,
+        "max_stages": int(max_stages) if compact_prompts and summarize_chains else None,
+        "json_mode": json_mode,
+        "stream": stream,
+        "routing": {"critical_slack": float(critical_slack), "deep_stages": int(deep_stages)} if route_models else None,
+        "bypass_cache": bypass_cache,
+        "pool_keys": [k["key"] for k in get_all_api_keys() if k.get("key")] if pool_keys else [],
+        "requests_per_minute": int(requests_per_minute),
+        "tokens_per_minute": int(tokens_per_minute),
+        "path_type": None if path_type == "any" else path_type,
+        "path_group": path_group or None,
+        "slack_below": slack_below if limit_slack else None,
         "show_raw_data": show_raw_data
     }
 
 
+def _validate_server_path(path: str) -> Optional[str]:
+    """Accept a server-side report path only if it is a file under SERVER_REPORT_DIRS"""
+    if not path:
+        return None
+    resolved = Path(path).resolve()
+    if not any(resolved.is_relative_to(root) for root in SERVER_REPORT_DIRS):
+        st.sidebar.error("❌ Report path is outside the allowed directories.")
+        return None
+    if not resolved.is_file():
+        st.sidebar.error("❌ Report file not found on the server.")
+        return None
+    return str(resolved)
+
+
 def display_analysis_results(analyses: List[Dict], config: Dict):
     """Display analysis results in an interactive format"""
     st.header("🤖 AI Analysis Results")
@@ -95,49 +350,166 @@ def display_analysis_results(analyses: List[Dict], config: Dict):
 
     # Detailed analysis for each path
     for i, analysis in enumerate(analyses, 1):
-        with st.expander(f"Path {i}: {analysis.get('startpoint')} → {analysis.get('endpoint')}"):
-            col1, col2 = st.columns([1, 2])
-
-            with col1:
-                st.subheader("Path Details")
-                st.info(f"**Type:** {analysis.get('path_type')}")
-                status = analysis.get('status')
-                if status == "VIOLATED":
-                    st.error(f"**Status:** {status} (Slack: {analysis.get('slack')} ns)")
-                    st.error(f"**Severity:** {analysis.get('severity', 'unknown')}")
-                else:
-                    st.success(f"**Status:** {status}")
-
-                st.write(f"**Startpoint:** {analysis.get('startpoint')}")
-                st.write(f"**Endpoint:** {analysis.get('endpoint')}")
-
-            with col2:
-                st.subheader("Technical Analysis")
-                if status == "VIOLATED":
-                    st.write(f"**Root Cause:** {analysis.get('root_cause')}")
-                    st.write(f"**Estimated Effort:** {analysis.get('estimated_effort')}")
-
-                    st.subheader("Recommended Fixes")
-                    suggestions = analysis.get('suggestions', [])
-                    for j, suggestion in enumerate(suggestions, 1):
-                        priority = suggestion.get('priority', '').upper()
-                        priority_color = {
-                            'HIGH': 'red',
-                            'MEDIUM': 'orange',
-                            'LOW': 'green'
-                        }.get(priority, 'gray')
-
-                        st.markdown(
-                            f"**{j}. {suggestion.get('fix')}** "
-                            f"<span style='color:{priority_color}'>[{priority}]</span>",
-                            unsafe_allow_html=True
-                        )
-                        st.caption(f"*{suggestion.get('explanation')}*")
-                else:
-                    st.success("✅ Timing requirements met successfully")
-
-
-def create_download_buttons(analyses: List[Dict], parsed_paths: List[TimingPath], api_key_id: Optional[str] = None):
+        display_analysis(i, analysis)
+
+
+def display_analysis(i: int, analysis: Dict, expanded: bool = False):
+    """Display one path's analysis in an expander; fields still streaming show as '…'"""
+    with st.expander(f"Path {i}: {analysis.get('startpoint')} → {analysis.get('endpoint')}", expanded=expanded):
+        col1, col2 = st.columns([1, 2])
+
+        with col1:
+            st.subheader("Path Details")
+            st.info(f"**Type:** {analysis.get('path_type')}")
+            if analysis.get('corner'):
+                st.info(f"**Worst Corner:** {analysis.get('corner')}")
+            status = analysis.get('status')
+            if status == "VIOLATED":
+                st.error(f"**Status:** {status} (Slack: {analysis.get('slack')} ns)")
+                st.error(f"**Severity:** {analysis.get('severity', '…')}")
+            else:
+                st.success(f"**Status:** {status}")
+
+            st.write(f"**Startpoint:** {analysis.get('startpoint')}")
+            st.write(f"**Endpoint:** {analysis.get('endpoint')}")
+            if analysis.get('source') == "rules":
+                st.caption("Diagnosed by local rules")
+            routing = analysis.get('routing')
+            if routing:
+                st.caption(
+                    f"Analyzed by {routing['model']} ({routing['reason']}"
+                    f"{'; escalated after an invalid fast-model answer' if routing['escalated'] else ''})"
+                )
+            if analysis.get('cluster'):
+                st.caption(
+                    f"Diagnosis shared by a cluster of {analysis['cluster']['size']} structurally "
+                    f"similar paths (analyzed: {analysis['cluster']['representative']})"
+                )
+            group = analysis.get('endpoint_group')
+            if group and group['collapsed']:
+                st.caption(
+                    f"Worst of {group['paths']} paths into this endpoint "
+                    f"({group['collapsed']} collapsed, {group['violated']} violated, "
+                    f"slack {group['worst_slack']} to {group['best_slack']} ns)"
+                )
+
+        with col2:
+            st.subheader("Technical Analysis")
+            if status == "VIOLATED":
+                st.write(f"**Root Cause:** {analysis.get('root_cause', '…')}")
+                st.write(f"**Estimated Effort:** {analysis.get('estimated_effort', '…')}")
+
+                st.subheader("Recommended Fixes")
+                suggestions = analysis.get('suggestions', [])
+                for j, suggestion in enumerate(suggestions, 1):
+                    priority = suggestion.get('priority', '').upper()
+                    priority_color = {
+                        'HIGH': 'red',
+                        'MEDIUM': 'orange',
+                        'LOW': 'green'
+                    }.get(priority, 'gray')
+
+                    st.markdown(
+                        f"**{j}. {suggestion.get('fix')}** "
+                        f"<span style='color:{priority_color}'>[{priority}]</span>",
+                        unsafe_allow_html=True
+                    )
+                    st.caption(f"*{suggestion.get('explanation')}*")
+            else:
+                st.success("✅ Timing requirements met successfully")
+
+
+def stream_analysis_results(analyzer: TimingAnalyzer, paths: List[PathRecord]) -> List[Dict]:
+    """
+    Analyze paths, rendering each result as soon as it arrives (worst slack
+    first) under a progress bar with an ETA. When the analyzer streams, a
+    path's root cause and suggestions appear as each is written. Returns the
+    analyses in input order; the live view is cleared once all have arrived.
+    """
+    total = len(paths)
+    results: Dict[int, Dict] = {}
+    slots: Dict[int, Any] = {}
+    live = st.empty()
+    with live.container():
+        st.subheader("⏳ Live Results (worst slack first)")
+        progress = st.progress(0.0, text=f"0/{total} paths analyzed")
+        start = time.monotonic()
+
+        async def consume():
+            async for i, result, final in analyzer.aiter_updates(paths):
+                if i not in slots:
+                    # One numbered placeholder per path, redrawn as more of its answer arrives
+                    slots[i] = (len(slots) + 1, st.empty())
+                number, slot = slots[i]
+                with slot.container():
+                    display_analysis(number, result, expanded=analyzer.stream)
+                if not final:
+                    continue
+                results[i] = result
+                done = len(results)
+                eta = (time.monotonic() - start) / done * (total - done)
+                progress.progress(done / total, text=f"{done}/{total} paths analyzed · ETA {eta:.0f}s")
+
+        asyncio.run(consume())
+    live.empty()
+    return [results[i] for i in range(total)]
+
+
+def display_token_usage(usage: TokenUsage):
+    """Show the prompt and completion tokens spent by the analysis"""
+    if not usage.calls:
+        return
+    totals = usage.totals()
+    with st.expander("🔢 Token Usage"):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("LLM Calls", totals["calls"])
+        col2.metric("Prompt Tokens", totals["prompt_tokens"])
+        col3.metric("Completion Tokens", totals["completion_tokens"])
+        col4.metric("Prompt Tokens / Path", f"{totals['prompt_tokens_per_path']:.0f}")
+        if totals["repair_calls"]:
+            st.caption(f"{totals['repair_calls']} short repair requests fixed invalid or missing fields")
+        if not all(call["reported"] for call in usage.calls):
+            st.caption("Some responses carried no usage report; their prompt tokens are estimated")
+        st.dataframe(pd.DataFrame(usage.calls))
+
+
+def export_json(
+    analyses: List[Dict],
+    parsed_paths: Iterable[PathRecord],
+    corner_merge: Optional[CornerMerge] = None,
+    endpoint_collapse: Optional[EndpointCollapse] = None,
+) -> BytesIO:
+    """
+    The JSON report. The parsed paths are written one at a time as they are
+    read from the table, so no list of path dicts is ever held alongside it.
+    """
+    export = {
+        "timestamp": datetime.now().isoformat(),
+        "analyses": analyses,
+    }
+    if corner_merge is not None:
+        export["corners"] = corner_merge.rows()
+    if endpoint_collapse is not None:
+        export["endpoint_groups"] = endpoint_collapse.groups()
+
+    buffer = BytesIO()
+    # Reopen the object to append the paths array as its last member
+    buffer.write(json.dumps(export, indent=2)[:-2].encode())
+    buffer.write(b',\n  "original_paths": [')
+    for i, path in enumerate(parsed_paths):
+        buffer.write(("," if i else "").encode() + b"\n    " + json.dumps(path.to_model().dict()).encode())
+    buffer.write(b"\n  ]\n}")
+    buffer.seek(0)
+    return buffer
+
+
+def create_download_buttons(
+    analyses: List[Dict],
+    parsed_paths: Iterable[PathRecord],
+    api_key_id: Optional[str] = None,
+    corner_merge: Optional[CornerMerge] = None,
+    endpoint_collapse: Optional[EndpointCollapse] = None,
+):
     """Create download buttons for analysis results"""
     user = get_current_user() or {}
     username = user.get("username", "Unknown")
@@ -146,11 +518,7 @@ def create_download_buttons(analyses: List[Dict], parsed_paths: List[TimingPath]
 
     with col1:
         # JSON download
-        json_data = json.dumps({
-            "timestamp": datetime.now().isoformat(),
-            "analyses": analyses,
-            "original_paths": [p.dict() for p in parsed_paths]
-        }, indent=2)
+        json_data = export_json(analyses, parsed_paths, corner_merge, endpoint_collapse)
 
         if st.download_button(
             label="📥 Download JSON Report",
@@ -185,7 +553,7 @@ def show_instructions():
     ## 📋 How to Use This Tool
 
     1. **Select API Key**: Choose an API key from the dropdown in the sidebar
-    2. **Upload Report**: Upload your STA timing report (.txt, .rpt, .log)
+    2. **Upload Report**: Upload your STA timing report (.txt, .rpt, .log, optionally .gz/.bz2/.xz compressed)
     3. **Configure**: Choose analysis options in the sidebar
     4. **Analyze**: Click the 'Run Analysis' button
     5. **Review**: Examine AI-powered insights and recommendations
@@ -211,52 +579,186 @@ def main_ui():
         show_instructions()
         return
 
-    if config["timing_file"] and config["api_key"]:
+    if (config["timing_file"] or config["server_path"] or config["corner_files"]) and config["api_key"]:
         if st.button("🚀 Run Analysis", type="primary"):
             api_key_id = config.get("api_key_id")
+
+            if config["corner_files"] and (config["timing_file"] or config["server_path"]):
+                st.error("❌ Provide either a single timing report or one report per corner, not both.")
+                return
+            corners = [corner_name(f.name) for f in config["corner_files"]]
+            duplicates = sorted({corner for corner in corners if corners.count(corner) > 1})
+            if duplicates:
+                st.error(f"❌ Several corner reports are named {', '.join(duplicates)}. Rename them so every corner is unique.")
+                return
             
             # Log the action
             log_action(username, "Run STA Analysis", api_key_id=api_key_id, details={
-                "filename": config["timing_file"].name,
-                "analyze_violations_only": config["analyze_violations_only"]
+                "filename": config["server_path"] or (config["timing_file"].name if config["timing_file"] else None),
+                "corner_files": [f.name for f in config["corner_files"]],
+                "analyze_violations_only": config["analyze_violations_only"],
+                "worst_k": config["worst_k"],
+                "worst_k_group": config["worst_k_group"],
+                "per_endpoint": config["per_endpoint"],
+                "slack_bucket": config["slack_bucket"],
+                "pre_analyze": config["pre_analyze"],
+                "routing": config["routing"],
+                "pooled_keys": len(config["pool_keys"]),
+                "path_type": config["path_type"],
+                "path_group": config["path_group"],
+                "slack_below": config["slack_below"]
             })
             
+            corner_merge = None
             with st.spinner("Parsing timing report..."):
-                report_content = config["timing_file"].getvalue().decode("utf-8")
-                parser = STAParser(report_content)
-                parsed_paths = parser.parse()
+                # Filters are pushed down so non-matching blocks are never fully parsed
+                parser = STAParser(
+                    status="VIOLATED" if config["analyze_violations_only"] else None,
+                    path_type=config["path_type"],
+                    path_group=config["path_group"],
+                    slack_below=config["slack_below"]
+                )
+                if config["server_path"]:
+                    # Server-side reports are scanned in place through a memory map
+                    source = map_report(config["server_path"]) or BytesIO()
+                    source_size = len(source.getbuffer()) if isinstance(source, BytesIO) else len(source)
+                else:
+                    source = config["timing_file"]
+                    source_size = source.size if source else 0
+
+                if source is None:
+                    # One report per corner: parsed in parallel, joined per path,
+                    # and only each path's worst-corner instance is analyzed.
+                    # Status and slack filters apply to that instance after the join.
+                    corner_merge = parse_corners(
+                        dict(zip(corners, config["corner_files"])), parser
+                    )
+                    if config["worst_k"]:
+                        corner_merge = corner_merge.worst(config["worst_k"], config["worst_k_group"])
+                    parsed_paths = corner_merge.paths
+                else:
+                    cache_options = parser.filter_options()
+                    if config["worst_k"]:
+                        cache_options.update(worst_k=config["worst_k"], worst_k_group=config["worst_k_group"])
+                    digest = report_digest(source, cache_options)
+                    parsed_paths = load_table(digest)
+                    # Compressed reports are decompressed incrementally as they are parsed
+                    report = open_report(source)
+                    compressed = report is not source
+                    if parsed_paths is None and source_size > LAZY_INDEX_BYTES and not compressed:
+                        # Huge reports: one scan indexes every block and peeks its slack,
+                        # which is shown right away; only the blocks selected on the
+                        # peeked columns are then parsed. Uploads are spooled to disk
+                        # and memory-mapped for the index.
+                        index = ReportIndex.build(source, parser)
+                        st.info(f"Indexed {len(index)} matching paths, {int(index.violated_mask().sum())} violated")
+                        if config["worst_k"]:
+                            index = index.worst(config["worst_k"], config["worst_k_group"])
+                        parsed_paths = index.to_table()
+                        store_table(digest, parsed_paths)
+                    elif parsed_paths is None and config["worst_k"]:
+                        # Bounded heap while streaming: memory stays O(K)
+                        worst = parser.worst_paths(report, config["worst_k"], config["worst_k_group"])
+                        parsed_paths = TimingPathTable.from_paths(worst)
+                        store_table(digest, parsed_paths)
+                    elif parsed_paths is None:
+                        parsed_paths = parser.parse_table(report)
+                        store_table(digest, parsed_paths)
 
             if not parsed_paths:
-                st.warning("No valid timing paths found in the report")
+                st.warning("No timing paths in the report match the selected options")
                 log_action(username, "STA Analysis Failed", api_key_id=api_key_id, details={"reason": "No valid timing paths found"})
                 return
 
-            # Filter paths if needed
-            if config["analyze_violations_only"]:
-                paths_to_analyze = [p for p in parsed_paths if p.status == "VIOLATED"]
-                st.info(f"Analyzing {len(paths_to_analyze)} violated paths (of {len(parsed_paths)} total)")
+            endpoint_collapse = None
+            clusters = None
+            # Every parsing branch above yields a TimingPathTable
+            table = parsed_paths
+            if config["per_endpoint"]:
+                # Only the worst path(s) into each endpoint go to the analyzer
+                endpoint_collapse = collapse_endpoints(table, config["per_endpoint"])
+                table = endpoint_collapse.paths
+            if config["pre_analyze"]:
+                # Paths the local rules diagnose confidently never reach the LLM
+                rule_results, llm_rows = pre_analyze(table)
+            else:
+                rule_results, llm_rows = {}, np.arange(len(table))
+            llm_table = table.select(llm_rows)
+            if config["slack_bucket"]:
+                # One representative per structural cluster goes to the LLM
+                clusters = cluster_paths(llm_table, config["slack_bucket"])
+                representatives = clusters.representative_paths().to_paths()
             else:
-                paths_to_analyze = parsed_paths
+                representatives = llm_table.to_paths()
+            if corner_merge is not None:
+                st.info(f"Analyzing {len(table)} paths, each at its worst of {len(corner_merge.corners)} corners")
+                with st.expander("🌐 Per-Corner Slack"):
+                    st.dataframe(pd.DataFrame(corner_merge.rows()))
+            elif config["worst_k"]:
+                st.info(f"Analyzing the {len(table)} worst paths by slack")
+            elif config["analyze_violations_only"]:
+                st.info(f"Analyzing {len(table)} violated paths")
+            if endpoint_collapse is not None and endpoint_collapse.collapsed:
+                st.info(
+                    f"Collapsed {endpoint_collapse.collapsed} redundant paths into "
+                    f"{len(endpoint_collapse.group_endpoint)} endpoint groups"
+                )
+                with st.expander("🎯 Endpoint Groups"):
+                    st.dataframe(pd.DataFrame(endpoint_collapse.groups()))
+            if rule_results:
+                st.info(f"{len(rule_results)} paths resolved by local rules; {len(llm_table)} left for the LLM")
+            if clusters is not None and len(clusters) < len(llm_table):
+                st.info(f"{len(llm_table)} paths fall into {len(clusters)} structural clusters; analyzing one per cluster")
 
             # Show raw data if requested
             if config["show_raw_data"]:
                 with st.expander("📊 Raw Parsed Data"):
                     st.json([p.dict() for p in parsed_paths])
 
-            # Run analysis
-            with st.spinner("Running AI analysis..."):
-                analyzer = TimingAnalyzer(config["api_key"])
-                analyses = analyzer.analyze_paths(paths_to_analyze)
-                
-                # Log analysis completion
-                log_action(username, "STA Analysis Completed", api_key_id=api_key_id, details={
-                    "total_paths": len(analyses),
-                    "violated_paths": sum(1 for a in analyses if a.get('status') == 'VIOLATED')
-                })
+            # Run analysis; results render as they arrive
+            analyzer = TimingAnalyzer(
+                config["api_key"],
+                concurrency=config["concurrency"],
+                batch_tokens=config["batch_tokens"],
+                use_cache=not config["bypass_cache"],
+                pool_keys=config["pool_keys"],
+                requests_per_minute=config["requests_per_minute"],
+                tokens_per_minute=config["tokens_per_minute"],
+                compact=config["compact_prompts"],
+                max_stages=config["max_stages"],
+                json_mode=config["json_mode"],
+                stream=config["stream"],
+                routing=RoutingPolicy(**config["routing"]) if config["routing"] else None
+            )
+            llm_analyses = stream_analysis_results(analyzer, representatives)
+            if clusters is not None:
+                llm_analyses = clusters.fan_out(llm_analyses)
+            analyses = [None] * len(table)
+            for row, analysis in zip(llm_rows.tolist(), llm_analyses):
+                analyses[row] = analysis
+            for row, analysis in rule_results.items():
+                analyses[row] = analysis
+            if endpoint_collapse is not None:
+                for i, analysis in enumerate(analyses):
+                    analysis["endpoint_group"] = endpoint_collapse.summary_for(i)
+            
+            # Log analysis completion
+            usage = analyzer.usage.totals()
+            log_action(username, "STA Analysis Completed", api_key_id=api_key_id, details={
+                "total_paths": len(analyses),
+                "violated_paths": sum(1 for a in analyses if a.get('status') == 'VIOLATED'),
+                "prompt_encoding": analyzer.encoding,
+                "prompt_tokens": usage["prompt_tokens"],
+                "completion_tokens": usage["completion_tokens"]
+            })
 
             # Display results
+            display_token_usage(analyzer.usage)
             display_analysis_results(analyses, config)
-            create_download_buttons(analyses, parsed_paths, api_key_id=api_key_id)
+            create_download_buttons(
+                analyses, parsed_paths, api_key_id=api_key_id,
+                corner_merge=corner_merge, endpoint_collapse=endpoint_collapse
+            )
 
     else:
         show_instructions()
@@ -1,96 +1,652 @@
-import re
+import bz2
+import gzip
+import heapq
+import lzma
+import mmap
+import os
 import json
+import shutil
 import tempfile
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, IO, Tuple, Union, AnyStr
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
-from app.models import TimingPath
-from io import BytesIO
+from app.models import (
+    PathRecord, SEGMENT_LAUNCH, SEGMENT_DATA, SEGMENT_CAPTURE, EDGE_NONE, EDGE_RISE, EDGE_FALL,
+    POINT_PIN, POINT_CLOCK_EDGE, POINT_CLOCK_NETWORK, POINT_CLOCK_RECONVERGENCE,
+    POINT_CLOCK_UNCERTAINTY, POINT_EXTERNAL_DELAY, POINT_LIBRARY,
+)
+from app.path_table import TimingPathTable, TimingPathTableBuilder
+from io import BytesIO, StringIO, BufferedReader
+
+# Bump whenever parser output changes so cached parse results are invalidated
+PARSER_VERSION = "4"
+
+# Target size of the chunks handed to each worker by STAParser.parse_parallel
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Scanned regions of a mapped report are released from RSS in steps of this size
+_RELEASE_BYTES = 16 * 1024 * 1024
+
+# Path Group / Path Type headers are expected within this many lines of Startpoint
+_HEADER_LINES = 8
+
+# Leading bytes that identify compressed reports
+_COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bzip2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+}
+_MAGIC_BYTES = 6
+
+# Grouping modes for STAParser.worst_paths, mapped to the header that keys each group
+WORST_K_GROUPS = {None: None, "path_group": "clock", "path_type": "path_type"}
+
+# Keyword dispatch for the line tokenizer in STAParser.parse_lines. Every
+# line is split once into at most four fields (delay, time, edge,
+# description) and classified from those fields with a single lookup.
+# Lines may be str or, when scanning bytes directly, bytes; the tables hold
+# both spellings so one lookup serves either.
+_EDGES = {"^": EDGE_RISE, "v": EDGE_FALL, b"^": EDGE_RISE, b"v": EDGE_FALL}
+_KEYWORDS = {
+    "Group:": "clock",
+    "Type:": "path_type",
+    "data": "total",
+    "slack": "slack",
+    "Slack": "slack",
+}
+_KEYWORDS.update({key.encode(): kind for key, kind in list(_KEYWORDS.items())})
+_TOTALS = {"arrival": "arrival", "required": "required", b"arrival": "arrival", b"required": "required"}
+_ENDPOINT = frozenset(("Endpoint:", b"Endpoint:"))
+_CORNER = frozenset(("Corner:", b"Corner:"))
+_MARKERS = {str: "Startpoint:", bytes: b"Startpoint:"}
+
+# Timing points are classified by the first word of their description
+# (and, for clock rows, the second)
+_POINT_KINDS = {
+    "clock": POINT_CLOCK_EDGE,
+    "input": POINT_EXTERNAL_DELAY,
+    "output": POINT_EXTERNAL_DELAY,
+    "library": POINT_LIBRARY,
+}
+_CLOCK_POINT_KINDS = {
+    "network": POINT_CLOCK_NETWORK,
+    "reconvergence": POINT_CLOCK_RECONVERGENCE,
+    "uncertainty": POINT_CLOCK_UNCERTAINTY,
+}
+_UNMARKED_POINTS: Dict[AnyStr, Tuple[str, int]] = {}
+_UNMARKED_POINTS_MAX = 4096
+
 
 class STAParser:
-    def __init__(self, sta_report: str):
+    def __init__(
+        self,
+        sta_report: str = "",
+        status: Optional[str] = None,
+        path_type: Optional[str] = None,
+        path_group: Optional[str] = None,
+        slack_below: Optional[float] = None,
+    ):
+        """
+        Predicates are pushed down into the parser: a block is dropped as soon
+        as the line deciding it is seen (Path Group / Path Type headers, or
+        the slack line, which is peeked before the logic chain is tokenized).
+        """
         self.report = sta_report
+        self.status = status
+        self.path_type = path_type
+        self.path_group = path_group
+        self.slack_below = slack_below
 
-    def parse(self) -> List[TimingPath]:
-        paths = []
-        blocks = self.report.strip().split("Startpoint:")
+    def filter_options(self) -> Dict[str, Any]:
+        """The predicates this parser applies (also used to key cached results)"""
+        return {
+            "status": self.status,
+            "path_type": self.path_type,
+            "path_group": self.path_group,
+            "slack_below": self.slack_below,
+        }
 
-        for block in blocks[1:]:
-            path_data = self._parse_block(block)
-            if path_data:
-                try:
-                    paths.append(TimingPath(**path_data))
-                except Exception as e:
-                    print(f"Error parsing block: {e}")
-                    continue
+    def parse(self) -> List[PathRecord]:
+        return list(self.iter_paths(StringIO(self.report)))
+
+    def iter_paths(self, fileobj: Union[IO, mmap.mmap, bytes]) -> Iterator[PathRecord]:
+        """
+        Stream timing paths from a text or binary file object, or scan a
+        memory-mapped report (see map_report) in place.
+
+        Each path is yielded as soon as its Startpoint block closes, so memory
+        is bounded by the largest single block rather than the report size.
+        """
+        for block in self._iter_blocks(fileobj):
+            path = self.parse_lines(block)
+            if path:
+                yield path
+
+    def parse_table(self, fileobj: Optional[Union[IO, mmap.mmap]] = None) -> TimingPathTable:
+        """Parse straight into a columnar TimingPathTable"""
+        if fileobj is None:
+            fileobj = StringIO(self.report)
+        builder = TimingPathTableBuilder()
+        for block in self._iter_blocks(fileobj):
+            path = self.parse_lines(block)
+            if path:
+                builder.add(path)
+        return builder.build()
+
+    def worst_paths(
+        self,
+        fileobj: Optional[Union[IO, mmap.mmap]] = None,
+        k: int = 200,
+        group_by: Optional[str] = None,
+    ) -> List[PathRecord]:
+        """
+        Stream the report and keep only the ``k`` paths with the lowest slack.
+
+        With ``group_by`` set to "path_group" or "path_type" the worst ``k`` are
+        kept per group. Memory is O(k) per group: a bounded heap holds the
+        current candidates, and blocks whose peeked slack cannot enter the
+        heap are never tokenized. Paths are returned worst first.
+        """
+        if group_by not in WORST_K_GROUPS:
+            raise ValueError(f"group_by must be one of {WORST_K_GROUPS}")
+        if fileobj is None:
+            fileobj = StringIO(self.report)
+        if k <= 0:
+            return []
+
+        header = WORST_K_GROUPS[group_by]
+        heaps: Dict[str, list] = {}
+        for seq, block in enumerate(self._iter_blocks(fileobj)):
+            slack, _ = self._peek_slack(block)
+            if slack is None:
+                continue
+            heap = heaps.setdefault(self.peek_header(block, header) if header else "", [])
+            # heap[0] holds the best (highest) slack among the current candidates
+            if len(heap) >= k and slack >= -heap[0][0]:
+                continue
+
+            path = self.parse_lines(block)
+            if path is None or path.slack is None:
+                continue
+            entry = (-path.slack, -seq, path)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+
+        entries = [entry for heap in heaps.values() for entry in heap]
+        entries.sort(key=lambda entry: (-entry[0], -entry[1]))
+        return [entry[2] for entry in entries]
+
+    def _iter_blocks(self, fileobj: Union[IO, mmap.mmap, bytes]) -> Iterator[List[AnyStr]]:
+        """Yield the lines of each Startpoint block as soon as it closes"""
+        if isinstance(fileobj, (mmap.mmap, bytes)):
+            yield from self._iter_buffer_blocks(fileobj)
+            return
+
+        filter_headers = self.path_type is not None or self.path_group is not None
+        block = None
+        for line in fileobj:
+            marker = line.find(_MARKERS[type(line)])
+            if marker == -1:
+                if block is not None:
+                    block.append(line)
+                    # Drop the rest of the block once a header rules it out
+                    if filter_headers and len(block) <= _HEADER_LINES and self._rejects_header(line):
+                        block = None
+                continue
+
+            if block is not None:
+                block.append(line[:marker])
+                yield block
+            block = [line[marker + len("Startpoint:"):]]
+
+        if block is not None:
+            yield block
+
+    def _iter_buffer_blocks(self, data: Union[mmap.mmap, bytes]) -> Iterator[List[bytes]]:
+        """Yield blocks from a memory-mapped (or in-memory) report by scanning for markers"""
+        marker = b"Startpoint:"
+        pages = PageReleaser(data)
+        pos = data.find(marker)
+        while pos != -1:
+            start = pos + len(marker)
+            pos = data.find(marker, start)
+            yield data[start:len(data) if pos == -1 else pos].split(b"\n")
+            pages.advance(start)
+
+    def parse_parallel(
+        self,
+        path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[PathRecord]:
+        """
+        Parse a report on several cores.
+
+        The report (the file at ``path``, or the in-memory report) is split at
+        Startpoint boundaries into chunks of roughly ``chunk_size`` bytes, each
+        chunk is parsed in a ProcessPoolExecutor worker, and the paths are
+        returned in report order, identical to parse().
+        """
+        if path is not None:
+            with open(path, "rb") as f:
+                if detect_compression(f.read(_MAGIC_BYTES)):
+                    raise ValueError("Compressed reports cannot be split into byte ranges; use iter_paths(open_report(path))")
+                size = os.fstat(f.fileno()).st_size
+                bounds = _chunk_bounds(f, size, chunk_size)
+            tasks = [(_parse_byte_range, (str(path), start, end, self.filter_options())) for start, end in bounds]
+        else:
+            text = self.report
+            bounds = _text_chunk_bounds(text, chunk_size)
+            tasks = [(_parse_text, (text[start:end], self.filter_options())) for start, end in bounds]
+
+        if len(tasks) <= 1:
+            return [p for func, args in tasks for p in func(*args)]
 
+        paths = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(func, *args) for func, args in tasks]
+            for future in futures:
+                paths.extend(future.result())
         return paths
 
-    def _parse_block(self, block: str) -> Optional[Dict[str, Any]]:
-        lines = block.strip().splitlines()
-        if not lines:
+    def _rejects_header(self, line: AnyStr) -> bool:
+        parts = line.split(None, 2)
+        kind = _KEYWORDS.get(parts[1]) if len(parts) > 1 else None
+        if kind == "clock" and self.path_group is not None:
+            return _header_value(line) != self.path_group
+        if kind == "path_type" and self.path_type is not None:
+            return _header_value(line) != self.path_type
+        return False
+
+    def _rejects_slack(self, lines: List[AnyStr]) -> bool:
+        """Apply the status and slack predicates using the peeked slack line"""
+        slack, status = self._peek_slack(lines)
+        if self.status is not None and status != self.status:
+            return True
+        if self.slack_below is not None and (slack is None or slack >= self.slack_below):
+            return True
+        return False
+
+    def _peek_slack(self, lines: List[AnyStr]) -> Tuple[Optional[float], str]:
+        """Read slack and status from the slack line near the end of a block"""
+        for line in reversed(lines):
+            parts = line.split(None, 2)
+            if len(parts) > 1 and _KEYWORDS.get(parts[1]) == "slack":
+                try:
+                    slack = float(parts[0])
+                except ValueError:
+                    continue
+                return slack, "VIOLATED" if _is_violated(line) else "MET"
+        return None, "MET"
+
+    def accepts_header(self, lines: List[AnyStr]) -> bool:
+        """Whether the Path Group / Path Type headers among a block's first lines pass the filters"""
+        return not any(self._rejects_header(line) for line in lines[:_HEADER_LINES])
+
+    @staticmethod
+    def header_lines(data: Union[mmap.mmap, bytes], start: int, end: int) -> List[bytes]:
+        """The lines at the top of the block at ``data[start:end]`` where its headers are expected"""
+        pos = start
+        for _ in range(_HEADER_LINES):
+            pos = data.find(b"\n", pos, end)
+            if pos == -1:
+                pos = end
+                break
+            pos += 1
+        return data[start:pos].split(b"\n")
+
+    def peek_header(self, lines: List[AnyStr], kind: str) -> str:
+        """Read a Path Group ("clock") or Path Type header from the top of a block"""
+        for line in lines[:_HEADER_LINES]:
+            parts = line.split(None, 2)
+            if len(parts) > 1 and _KEYWORDS.get(parts[1]) == kind:
+                return _header_value(line)
+        return ""
+
+    def _parse_block(self, block: str) -> Optional[PathRecord]:
+        return self.parse_lines(block.splitlines())
+
+    def parse_lines(self, lines: List[AnyStr]) -> Optional[PathRecord]:
+        """Parse the lines of one Startpoint block (after the marker); None if the filters drop it"""
+        if (self.status is not None or self.slack_below is not None) and self._rejects_slack(lines):
             return None
 
-        startpoint = lines[0].strip()
+        startpoint = None
         endpoint = ""
         clock = ""
         path_type = ""
+        corner = ""
         data_arrival = None
         data_required = None
         slack = None
         status = "MET"
         logic_chain = []
+        timing_points = []
+        segment = SEGMENT_LAUNCH
+        # Set once the startpoint's clock pin closes the launch clock segment
+        clock_pin_seen = False
 
         for line in lines:
-            line = line.strip()
-            if line.startswith("Endpoint:"):
-                endpoint = line.replace("Endpoint:", "").strip()
-            elif line.startswith("Path Group:"):
-                clock = line.replace("Path Group:", "").strip()
-            elif line.startswith("Path Type:"):
-                path_type = line.replace("Path Type:", "").strip()
-            elif "data arrival time" in line and data_arrival is None:
+            parts = line.split(None, 3)
+            if not parts:
+                continue
+            if startpoint is None:
+                # Bytes lines come from scanning a mapped report; only the
+                # extracted fields are decoded.
+                binary = isinstance(line, bytes)
+                startpoint = _text(line.strip())
+                start_name = parts[0]
+                start_pins = start_name + (b"/" if binary else "/")
+                continue
+
+            if len(parts) == 4 and parts[2] in _EDGES:
                 try:
-                    data_arrival = float(line.split()[0])
-                except (ValueError, IndexError):
-                    pass
-            elif "data required time" in line and data_required is None:
-                try:
-                    data_required = float(line.split()[0])
-                except (ValueError, IndexError):
-                    pass
-            elif "slack" in line.lower():
-                parts = line.split()
-                try:
-                    slack = float(parts[0])
-                    if "violated" in line.lower():
-                        status = "VIOLATED"
-                except (ValueError, IndexError):
-                    pass
-            elif re.search(r"\s+[0-9]", line) and ("v " in line or "^ " in line):
-                parts = line.split()
-                if len(parts) >= 3:
+                    delay = float(parts[0])
+                except ValueError:
+                    continue
+                if binary:
+                    cell = (parts[2] + b" " + parts[3].rstrip()).decode("utf-8")
+                else:
+                    cell = f"{parts[2]} {parts[3].rstrip()}"
+                logic_chain.append((cell, delay))
+                if segment is not None:
+                    external = cell.endswith("external delay")
+                    if segment == SEGMENT_LAUNCH:
+                        # Clock-expanded reports list the launch clock tree before
+                        # the startpoint's clock pin; data launches after that pin,
+                        # or at an input port / its external delay
+                        pin = parts[3].split(None, 1)[0]
+                        if external or clock_pin_seen or pin == start_name or not timing_points:
+                            segment = SEGMENT_DATA
+                        elif pin.startswith(start_pins):
+                            clock_pin_seen = True
+                    # Marked rows are pins except for input/output external delay;
+                    # outside the data segment they are clock-tree pins
+                    if external:
+                        kind = POINT_EXTERNAL_DELAY
+                    elif segment == SEGMENT_DATA:
+                        kind = POINT_PIN
+                    else:
+                        kind = POINT_CLOCK_NETWORK
+                    try:
+                        timing_points.append((segment, kind, _EDGES[parts[2]], delay, float(parts[1]), cell))
+                    except ValueError:
+                        pass
+                continue
+
+            if len(parts) > 2 and parts[1] in _EDGES:
+                # Time-only point, e.g. the capture clock pin
+                if segment is not None:
+                    try:
+                        arrival = float(parts[0])
+                    except ValueError:
+                        continue
+                    description = line.split(None, 1)[1].rstrip()
+                    if binary:
+                        description = description.decode("utf-8")
+                    timing_points.append((segment, POINT_PIN, _EDGES[parts[1]], None, arrival, description))
+                continue
+
+            kind = _KEYWORDS.get(parts[1]) if len(parts) > 1 else None
+            if kind is None:
+                if parts[0] in _ENDPOINT:
+                    endpoint = _header_value(line)
+                elif parts[0] in _CORNER:
+                    corner = _header_value(line)
+                elif segment is not None and len(parts) > 2:
+                    # Unmarked point: clock edges, clock network delay, library time
                     try:
                         delay = float(parts[0])
+                        arrival = float(parts[1])
                     except ValueError:
-                        delay = 0.0
-                    description = " ".join(parts[2:])
-                    logic_chain.append({"cell": description, "delay": delay})
+                        continue
+                    description, point_kind = _unmarked_point(line.split(None, 2)[2])
+                    timing_points.append((segment, point_kind, EDGE_NONE, delay, arrival, description))
+                continue
+
+            if kind == "clock":
+                clock = _header_value(line)
+                if self.path_group is not None and clock != self.path_group:
+                    return None
+            elif kind == "path_type":
+                path_type = _header_value(line)
+                if self.path_type is not None and path_type != self.path_type:
+                    return None
+            else:
+                try:
+                    value = float(parts[0])
+                except ValueError:
+                    continue
+                if kind == "slack":
+                    slack = value
+                    if _is_violated(line):
+                        status = "VIOLATED"
+                else:
+                    total = _TOTALS.get(parts[2]) if len(parts) > 2 else None
+                    if total == "arrival" and data_arrival is None:
+                        data_arrival = value
+                        segment = SEGMENT_CAPTURE
+                    elif total == "required" and data_required is None:
+                        data_required = value
+                        # The rest of the table repeats the totals
+                        segment = None
+
+        if startpoint is None:
+            return None
 
-        return {
-            "startpoint": startpoint,
-            "endpoint": endpoint,
-            "clock": clock,
-            "path_type": path_type,
-            "data_arrival_time": data_arrival,
-            "data_required_time": data_required,
-            "slack": slack,
-            "status": status,
-            "logic_chain": logic_chain
-        }
+        return PathRecord(
+            startpoint,
+            endpoint,
+            clock,
+            path_type,
+            data_arrival,
+            data_required,
+            slack,
+            status,
+            logic_chain,
+            timing_points,
+            corner,
+        )
+
+
+def _unmarked_point(raw: AnyStr) -> Tuple[str, int]:
+    """Decode and classify the description of an unmarked point (memoized; these repeat per clock)"""
+    point = _UNMARKED_POINTS.get(raw)
+    if point is None:
+        description = _text(raw.rstrip())
+        point = (description, _point_kind(description))
+        if len(_UNMARKED_POINTS) < _UNMARKED_POINTS_MAX:
+            _UNMARKED_POINTS[raw] = point
+    return point
+
+
+def _point_kind(description: str) -> int:
+    """Classify a timing point from its description"""
+    words = description.split(None, 2)
+    kind = _POINT_KINDS.get(words[0], POINT_PIN)
+    if kind == POINT_CLOCK_EDGE:
+        if len(words) > 1 and words[1] in _CLOCK_POINT_KINDS:
+            return _CLOCK_POINT_KINDS[words[1]]
+        return kind if description.endswith("edge)") else POINT_PIN
+    if kind == POINT_EXTERNAL_DELAY and (len(words) < 2 or words[1] != "external"):
+        return POINT_PIN
+    return kind
+
+
+def _text(value: AnyStr) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _header_value(line: AnyStr) -> str:
+    """The stripped text after the first colon of a header line"""
+    return _text(line.split(b":" if isinstance(line, bytes) else ":", 1)[1].strip())
+
+
+def _is_violated(line: AnyStr) -> bool:
+    return (b"VIOLATED" if isinstance(line, bytes) else "VIOLATED") in line.upper()
+
+
+def map_report(source: Union[str, os.PathLike, IO]) -> Union[mmap.mmap, bytes]:
+    """
+    Memory-map a report so the parser can scan its bytes in place.
+
+    Paths (e.g. reports on a shared filesystem) are mapped directly. File
+    objects without a backing file, such as uploads, are first spooled to an
+    anonymous temporary file in 1 MB chunks.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return _map_file(f)
+
+    try:
+        source.fileno()
+        return _map_file(source)
+    except (AttributeError, OSError):
+        pass
+
+    source.seek(0)
+    with tempfile.TemporaryFile() as spool:
+        shutil.copyfileobj(source, spool, 1024 * 1024)
+        spool.flush()
+        # The mapping stays valid after the spool file is closed
+        mapped = _map_file(spool)
+    source.seek(0)
+    return mapped
+
+
+class PageReleaser:
+    """
+    Drops the already-scanned pages of a mapped report from our resident set
+    in steps of _RELEASE_BYTES. They stay in the page cache, so peak RSS does
+    not grow with the report size. Does nothing for in-memory bytes.
+    """
+
+    def __init__(self, data: Union[mmap.mmap, bytes]):
+        self.data = data
+        self.enabled = isinstance(data, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+        self.released = 0
+        if self.enabled:
+            data.madvise(mmap.MADV_SEQUENTIAL)
+
+    def advance(self, pos: int):
+        """The scan has moved past ``pos``; release the pages before it once a full step has accumulated"""
+        if self.enabled and pos - self.released >= _RELEASE_BYTES:
+            end = pos - pos % mmap.PAGESIZE
+            self.data.madvise(mmap.MADV_DONTNEED, self.released, end - self.released)
+            self.released = end
+
+    def finish(self):
+        """The scan is done; release the rest of the mapping"""
+        if self.enabled and len(self.data) > self.released:
+            self.data.madvise(mmap.MADV_DONTNEED, self.released, len(self.data) - self.released)
+            self.released = len(self.data)
+
+
+def _map_file(f: IO) -> Union[mmap.mmap, bytes]:
+    if os.fstat(f.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Identify gzip, bzip2 or xz data from its leading magic bytes"""
+    for name, magic in _COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_report(source: Union[str, os.PathLike, IO]) -> IO:
+    """
+    Open a report path or binary file object for streaming.
+
+    Compressed reports (.gz, .bz2, .xz) are detected from their magic bytes
+    and wrapped in an incremental decompressor, so the parser reads
+    decompressed lines without the full text ever being materialized.
+    """
+    fileobj = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    if isinstance(fileobj, (mmap.mmap, bytes)):
+        head = fileobj[:_MAGIC_BYTES]
+    elif hasattr(fileobj, "peek"):
+        head = fileobj.peek(_MAGIC_BYTES)[:_MAGIC_BYTES]
+    elif fileobj.seekable():
+        position = fileobj.tell()
+        head = fileobj.read(_MAGIC_BYTES)
+        fileobj.seek(position)
+    else:
+        fileobj = BufferedReader(fileobj)
+        head = fileobj.peek(_MAGIC_BYTES)[:_MAGIC_BYTES]
+
+    compression = detect_compression(head)
+    if compression and isinstance(fileobj, bytes):
+        fileobj = BytesIO(fileobj)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fileobj)
+    if compression == "bzip2":
+        return bz2.BZ2File(fileobj)
+    if compression == "xz":
+        return lzma.LZMAFile(fileobj)
+    return fileobj
+
+
+def _chunk_bounds(f: IO, size: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split a binary report into byte ranges that start at Startpoint markers"""
+    marker = b"Startpoint:"
+    starts = [0]
+    pos = chunk_size
+    while pos < size:
+        f.seek(pos)
+        carry = b""
+        found = -1
+        scanned = pos
+        while True:
+            buf = f.read(1024 * 1024)
+            if not buf:
+                break
+            window = carry + buf
+            idx = window.find(marker)
+            if idx != -1:
+                found = scanned - len(carry) + idx
+                break
+            carry = window[-(len(marker) - 1):]
+            scanned += len(buf)
+        if found == -1:
+            break
+        starts.append(found)
+        pos = found + chunk_size
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _text_chunk_bounds(text: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split an in-memory report into ranges that start at Startpoint markers"""
+    starts = [0]
+    pos = chunk_size
+    while pos < len(text):
+        found = text.find("Startpoint:", pos)
+        if found == -1:
+            break
+        starts.append(found)
+        pos = found + chunk_size
+    return list(zip(starts, starts[1:] + [len(text)]))
+
+
+def _parse_byte_range(path: str, start: int, end: int, options: Dict[str, Any]) -> List[PathRecord]:
+    """Worker entry point: parse one byte range of a report file"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return list(STAParser(**options).iter_paths(data))
+
+
+def _parse_text(text: str, options: Dict[str, Any]) -> List[PathRecord]:
+    """Worker entry point: parse one chunk of report text"""
+    return STAParser(text, **options).parse()
 
 
 def generate_pdf_report(analyses: List[Dict], output_path: str):
@@ -201,6 +757,17 @@ def generate_pdf_bytes(analyses: List[Dict]) -> bytes:
                     ["Severity", analysis.get('severity', 'N/A').upper()],
                     ["Estimated Effort", analysis.get('estimated_effort', 'N/A').upper()]
                 ]
+                if analysis.get('corner'):
+                    data.insert(2, ["Worst Corner", analysis['corner']])
+                if analysis.get('cluster'):
+                    data.append(["Cluster", f"{analysis['cluster']['size']} paths share this diagnosis"])
+                group = analysis.get('endpoint_group')
+                if group and group['collapsed']:
+                    data.append([
+                        "Endpoint Paths",
+                        f"{group['paths']} ({group['collapsed']} collapsed, "
+                        f"slack {group['worst_slack']} to {group['best_slack']} ns)"
+                    ])
 
                 table = Table(data, colWidths=[120, 380])
                 table.setStyle(TableStyle([
@@ -0,0 +1,144 @@
+"""
+Parser throughput benchmark.
+
+Replicates the bundled app/data/timing_report*.txt files up to a target
+size and compares the legacy substring/split line classifier against the
+keyword-dispatch tokenizer used by STAParser.
+
+    python benchmarks/parser_bench.py --paths 200000
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.utils import STAParser  # noqa: E402
+
+DATA_DIR = ROOT / "app" / "data"
+
+# Clock skew of each path in the clock-expanded fixture (capture minus launch latency)
+CLOCK_EXPANDED_SKEW = [-0.04, 0.07]
+
+
+def legacy_parse_block(block: str) -> Optional[Dict[str, Any]]:
+    """The original STAParser._parse_block, kept as the baseline"""
+    lines = block.strip().splitlines()
+    if not lines:
+        return None
+
+    startpoint = lines[0].strip()
+    endpoint = ""
+    clock = ""
+    path_type = ""
+    data_arrival = None
+    data_required = None
+    slack = None
+    status = "MET"
+    logic_chain = []
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("Endpoint:"):
+            endpoint = line.replace("Endpoint:", "").strip()
+        elif line.startswith("Path Group:"):
+            clock = line.replace("Path Group:", "").strip()
+        elif line.startswith("Path Type:"):
+            path_type = line.replace("Path Type:", "").strip()
+        elif "data arrival time" in line and data_arrival is None:
+            try:
+                data_arrival = float(line.split()[0])
+            except (ValueError, IndexError):
+                pass
+        elif "data required time" in line and data_required is None:
+            try:
+                data_required = float(line.split()[0])
+            except (ValueError, IndexError):
+                pass
+        elif "slack" in line.lower():
+            parts = line.split()
+            try:
+                slack = float(parts[0])
+                if "violated" in line.lower():
+                    status = "VIOLATED"
+            except (ValueError, IndexError):
+                pass
+        elif re.search(r"\s+[0-9]", line) and ("v " in line or "^ " in line):
+            parts = line.split()
+            if len(parts) >= 3:
+                try:
+                    delay = float(parts[0])
+                except ValueError:
+                    delay = 0.0
+                description = " ".join(parts[2:])
+                logic_chain.append({"cell": description, "delay": delay})
+
+    return {
+        "startpoint": startpoint,
+        "endpoint": endpoint,
+        "clock": clock,
+        "path_type": path_type,
+        "data_arrival_time": data_arrival,
+        "data_required_time": data_required,
+        "slack": slack,
+        "status": status,
+        "logic_chain": logic_chain
+    }
+
+
+def build_report(target_paths: int) -> str:
+    """Concatenate the bundled reports until the target path count is reached"""
+    samples = [p.read_text() for p in sorted(DATA_DIR.glob("timing_report*.txt"))]
+    unit = "\n".join(samples)
+    per_unit = unit.count("Startpoint:")
+    copies = max(1, target_paths // per_unit)
+    return "\n".join([unit] * copies)
+
+
+def time_blocks(parse_block, blocks: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for block in blocks:
+            parse_block(block)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=100000, help="approximate number of paths in the report")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    report = build_report(args.paths)
+    blocks = report.split("Startpoint:")[1:]
+    n_lines = report.count("\n") + 1
+    print(f"report: {len(report) / 1e6:.1f} MB, {len(blocks)} paths, {n_lines} lines")
+
+    sta = STAParser()
+    for block in blocks[:50]:
+        record = sta._parse_block(block).dict()
+        # The legacy parser predates multi-corner reports
+        record.pop("corner")
+        assert legacy_parse_block(block) == record, "tokenizer output differs from legacy parser"
+
+    # Clock-tree pins of a clock-expanded report count as launch / capture latency
+    with open(DATA_DIR / "clock_expanded_report.txt") as f:
+        skew = [round(path.clock_summary()["clock_skew"], 6) for path in sta.iter_paths(f)]
+    assert skew == CLOCK_EXPANDED_SKEW, f"clock-expanded skew {skew} != {CLOCK_EXPANDED_SKEW}"
+
+    legacy = time_blocks(legacy_parse_block, blocks, args.repeat)
+    current = time_blocks(sta._parse_block, blocks, args.repeat)
+
+    print(f"legacy classifier:  {n_lines / legacy:>12,.0f} lines/s  ({legacy:.2f} s)")
+    print(f"dispatch tokenizer: {n_lines / current:>12,.0f} lines/s  ({current:.2f} s)")
+    print(f"speedup: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
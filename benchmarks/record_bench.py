@@ -0,0 +1,78 @@
+"""
+Path record benchmark.
+
+Compares building validated pydantic TimingPath models against the
+PathRecord records produced on the parser hot path: objects per
+second and bytes retained per path.
+
+    python benchmarks/record_bench.py --paths 50000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.models import TimingPath, PathRecord  # noqa: E402
+from app.utils import STAParser  # noqa: E402
+from benchmarks.parser_bench import build_report  # noqa: E402
+
+
+def build_models(rows):
+    """What the parser did before: one validated model per path"""
+    return [
+        TimingPath(
+            startpoint=sp, endpoint=ep, clock=clock, path_type=path_type, data_arrival_time=arrival,
+            data_required_time=required, slack=slack, status=status,
+            logic_chain=[{"cell": cell, "delay": delay} for cell, delay in chain],
+        )
+        for sp, ep, clock, path_type, arrival, required, slack, status, chain in rows
+    ]
+
+
+def build_records(rows):
+    """What the parser does now: unvalidated slotted records"""
+    return [
+        PathRecord(
+            sp, ep, clock, path_type, arrival, required, slack, status,
+            [(cell, delay) for cell, delay in chain],
+        )
+        for sp, ep, clock, path_type, arrival, required, slack, status, chain in rows
+    ]
+
+
+def measure(build, rows):
+    start = time.perf_counter()
+    build(rows)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    objects = build(rows)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return len(rows) / elapsed, retained / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, default=50000, help="approximate number of paths to build")
+    args = parser.parse_args()
+
+    rows = [
+        (r.startpoint, r.endpoint, r.clock, r.path_type, r.data_arrival_time,
+         r.data_required_time, r.slack, r.status, [tuple(stage) for stage in r.logic_chain])
+        for r in STAParser(build_report(args.paths)).parse()
+    ]
+    print(f"{len(rows)} paths, {sum(len(row[-1]) for row in rows)} stages")
+
+    for name, build in (("pydantic TimingPath", build_models), ("PathRecord", build_records)):
+        rate, per_path = measure(build, rows)
+        print(f"{name:<20} {rate:>10,.0f} objects/s  {per_path:>8,.0f} bytes/path")
+
+
+if __name__ == "__main__":
+    main()